@@ -1,14 +1,30 @@
 import streamlit as st
+import pandas as pd
+import numpy as np
+import asyncio
+import json
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor, Future
 from dotenv import load_dotenv
-from src.models import ScenarioParams, FinancialReport
+from src.models import ScenarioParams, FinancialReport, CriticVerdict
+from src.cache import DiskCache, make_key, quantize_params
 from src.agents.landing_ai import LandingAIClient
 from src.agents.simulator import SimulatorAgent
 from src.agents.critic import CriticAgent
 from src.agents.evaluator import EvaluatorAgent
+from src.agents.debate_agent import DebateAgent
 
-# Load env vars
-load_dotenv()
+# Load env vars (once per process; .env doesn't change between reruns)
+@st.cache_resource
+def _load_env():
+    load_dotenv()
+
+_load_env()
+LANDINGAI_API_KEY = os.environ.get("LANDINGAI_API_KEY")
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY")
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
 # Page config
 st.set_page_config(
@@ -17,38 +33,125 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load custom CSS
-css_path = "styles.css" if os.path.exists("styles.css") else "counterfactual_oracle/styles.css"
-with open(css_path) as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# Load custom CSS (read once per process, not on every rerun)
+@st.cache_resource
+def _css() -> str:
+    css_path = "styles.css" if os.path.exists("styles.css") else "counterfactual_oracle/styles.css"
+    with open(css_path) as f:
+        return f"<style>{f.read()}</style>"
+
+st.markdown(_css(), unsafe_allow_html=True)
 
 # Helper function to format currency (values already in millions)
 def format_currency(value, decimals=0):
     """Format currency values with commas (no suffix)"""
     return f"${value:,.{decimals}f}"
 
-# Sidebar
-with st.sidebar:
-    # Header with branding
-    st.markdown("""
-    <div style="padding: 1rem 0; border-bottom: 1px solid var(--sidebar-border); margin-bottom: 1.25rem;">
-        <div style="display: flex; align-items: center; gap: 0.75rem; margin-bottom: 0.75rem;">
-            <div style="background: linear-gradient(135deg, #3B82F6, #8B5CF6); padding: 0.5rem; border-radius: 0.5rem;">
-                <span style="font-size: 1.25rem;">🔮</span>
-            </div>
-            <div>
-                <h1 style="font-size: 1.125rem; margin: 0; line-height: 1.2;">Counterfactual Oracle</h1>
-                <p style="font-size: 0.75rem; color: var(--muted-foreground); margin: 0;">AI Financial Platform</p>
-            </div>
+# Static HTML blocks
+METRIC_CARD = (
+    '<div class="metric-card"><p class="metric-label">{label}</p>'
+    '<p class="metric-value" style="color: {color};">{value}</p>'
+    '<p class="metric-subtitle">{subtitle}</p></div>'
+)
+
+SIDEBAR_HEADER_HTML = """
+<div style="padding: 1rem 0; border-bottom: 1px solid var(--sidebar-border); margin-bottom: 1.25rem;">
+    <div style="display: flex; align-items: center; gap: 0.75rem; margin-bottom: 0.75rem;">
+        <div style="background: linear-gradient(135deg, #3B82F6, #8B5CF6); padding: 0.5rem; border-radius: 0.5rem;">
+            <span style="font-size: 1.25rem;">🔮</span>
         </div>
-        <div style="display: flex; align-items: center; gap: 0.5rem;">
-            <div style="flex: 1; height: 4px; background: var(--muted); border-radius: 9999px; overflow: hidden;">
-                <div style="height: 100%; width: 75%; background: linear-gradient(90deg, #3B82F6, #8B5CF6); border-radius: 9999px;"></div>
-            </div>
-            <span style="font-size: 0.75rem; color: var(--muted-foreground); font-family: 'JetBrains Mono', monospace;">v2.4.1</span>
+        <div>
+            <h1 style="font-size: 1.125rem; margin: 0; line-height: 1.2;">Counterfactual Oracle</h1>
+            <p style="font-size: 0.75rem; color: var(--muted-foreground); margin: 0;">AI Financial Platform</p>
+        </div>
+    </div>
+    <div style="display: flex; align-items: center; gap: 0.5rem;">
+        <div style="flex: 1; height: 4px; background: var(--muted); border-radius: 9999px; overflow: hidden;">
+            <div style="height: 100%; width: 75%; background: linear-gradient(90deg, #3B82F6, #8B5CF6); border-radius: 9999px;"></div>
+        </div>
+        <span style="font-size: 0.75rem; color: var(--muted-foreground); font-family: 'JetBrains Mono', monospace;">v2.4.1</span>
+    </div>
+</div>
+"""
+
+MAIN_HEADER_HTML = """
+<div class="main-header">
+    <div style="display: flex; align-items: center; gap: 0.75rem; margin-bottom: 0.25rem;">
+        <h1>Analysis Dashboard</h1>
+        <div class="status-badge success">
+            <span style="font-size: 0.625rem;">●</span>
+            <span>LIVE</span>
+        </div>
+    </div>
+    <p>Real-time financial modeling • Scenario analysis • Risk assessment</p>
+</div>
+"""
+
+WELCOME_HTML = """
+<div style="text-align: center; padding: 4rem 2rem;">
+    <div style="font-size: 4rem; margin-bottom: 1rem;">🔮</div>
+    <h2 style="margin-bottom: 0.5rem;">Welcome to Counterfactual Financial Oracle</h2>
+    <p style="color: var(--muted-foreground); margin-bottom: 2rem;">Upload a financial report to begin your analysis</p>
+    <div style="max-width: 600px; margin: 0 auto; text-align: left;">
+        <h3 style="font-size: 1rem; margin-bottom: 1rem;">Features:</h3>
+        <ul style="color: var(--muted-foreground); line-height: 1.8;">
+            <li>🤖 AI-powered document extraction with Landing AI</li>
+            <li>📈 Monte Carlo simulation (10,000 scenarios)</li>
+            <li>🛡️ Adversarial critique with DeepSeek</li>
+            <li>📊 DCF valuation with Gordon Growth model</li>
+            <li>📄 Professional PDF report generation</li>
+        </ul>
+    </div>
+</div>
+"""
+
+FOOTER_HTML = """
+<div class="footer">
+    <div style="display: flex; justify-content: space-between; align-items: center;">
+        <div style="display: flex; gap: 1.5rem;">
+            <span>Last updated: 2024-11-19 14:34:22 UTC</span>
+            <span>•</span>
+            <span>Compute time: 2.847s</span>
+            <span>•</span>
+            <span style="display: flex; align-items: center; gap: 0.375rem;">
+                <span style="width: 6px; height: 6px; border-radius: 50%; background: var(--success);"></span>
+                All systems operational
+            </span>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    </div>
+</div>
+"""
+
+@st.fragment
+def scenario_controls():
+    """Scenario sliders as an isolated fragment; only a submit reruns the full dashboard"""
+    # Sliders live in a form so dragging them doesn't rerun anything; only submit does
+    with st.form("scenario_controls", border=False):
+        opex_delta = st.slider("OpEx Delta", -500, 500, 0, format="%+d bps", help="Basis points change in operating expenses")
+        rev_growth_delta = st.slider("Revenue Growth Delta", -500, 500, 0, format="%+d bps", help="Basis points change in revenue growth")
+        discount_rate_delta = st.slider("Discount Rate Delta", -500, 500, 0, format="%+d bps", help="Basis points change in discount rate")
+        st.checkbox("Force fresh", key="force_fresh", help="Bypass cached critic verdicts and debates for nearby scenarios")
+        st.checkbox("Reuse nearby debates", key="semantic_cache", help="Replay a stored debate for a scenario within 10 bps of this one instead of debating it afresh")
+        
+        st.markdown("---")
+        
+        # Action Buttons
+        submitted = st.form_submit_button("▶️ Run Analysis", use_container_width=True, type="primary")
+    
+    if submitted:
+        st.session_state.scenario = ScenarioParams(
+            opex_delta_bps=opex_delta,
+            revenue_growth_bps=rev_growth_delta,
+            discount_rate_bps=discount_rate_delta
+        )
+        st.session_state.run_requested = True
+        st.rerun(scope="app")
+
+# Sidebar
+with st.sidebar:
+    # Header with branding
+    st.markdown(SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -74,40 +177,393 @@ with st.sidebar:
         *Note: 100 bps (basis points) = 1%*
         """)
 
-    opex_delta = st.slider("OpEx Delta", -500, 500, 0, help="Basis points change in operating expenses")
-    st.markdown(f'<div style="text-align: right; margin-top: -1rem; margin-bottom: 0.5rem;"><span class="mono" style="color: var(--primary); font-size: 0.875rem;">{opex_delta:+d} bps</span></div>', unsafe_allow_html=True)
+    scenario_controls()
+
+# Main Content
+st.markdown(MAIN_HEADER_HTML, unsafe_allow_html=True)
+
+# Main Area
+# Initialize Agents (moved here to be available for upload section)
+@st.cache_resource
+def get_agents():
+    """Build the agent clients once per process instead of on every rerun"""
+    return {
+        "landing": LandingAIClient(api_key=LANDINGAI_API_KEY),
+        "simulator": SimulatorAgent(api_key=GEMINI_API_KEY),
+        "critic": CriticAgent(api_key=DEEPSEEK_API_KEY),
+        "evaluator": EvaluatorAgent()
+    }
+
+agents = get_agents()
+landing_client = agents["landing"]
+simulator = agents["simulator"]
+critic = agents["critic"]
+evaluator = agents["evaluator"]
+
+@st.cache_resource
+def get_caches():
+    """On-disk LLM output caches, shared across sessions and restarts"""
+    return {"critic": DiskCache("critic")}
+
+caches = get_caches()
+
+def scenario_key(report_json: str, params: ScenarioParams) -> str:
+    """Cache key for LLM outputs: the report plus the scenario snapped to a 10 bp grid"""
+    return make_key(report_json, quantize_params(params))
+
+async def gather_analysis(report, params, cache_key=None, force_fresh=False):
+    """Run the simulator alongside the critic's report pre-check, then critique the results"""
+    cached = None if force_fresh or cache_key is None else caches["critic"].get(cache_key)
+    if cached is not None:
+        # A nearby scenario was already critiqued; only the Monte Carlo needs rerunning
+        simulation_results = await simulator.arun_simulation(report, params)
+        return simulation_results, CriticVerdict.model_validate_json(cached)
+    
+    simulation_results, precheck = await asyncio.gather(
+        simulator.arun_simulation(report, params),
+        critic.aprecheck(report)
+    )
+    critic_verdict = await critic.acritique(report, simulation_results, precheck)
+    # The rule-based fallback leaves cash_flow_check empty; don't pin an outage verdict
+    if cache_key is not None and critic_verdict.cash_flow_check:
+        caches["critic"].set(cache_key, critic_verdict.model_dump_json())
+    return simulation_results, critic_verdict
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_analysis(report_json: str, params_json: str):
+    """Simulation + critique memoized on the exact report and scenario, so repeat clicks skip Monte Carlo"""
+    params = ScenarioParams.model_validate_json(params_json)
+    return asyncio.run(gather_analysis(
+        FinancialReport.model_validate_json(report_json),
+        params,
+        scenario_key(report_json, params)
+    ))
+
+@st.cache_data(show_spinner=False)
+def _segment_table(report_json: str) -> pd.DataFrame:
+    """Segment performance table, built once per report"""
+    report = FinancialReport.model_validate_json(report_json)
+    df = pd.DataFrame([s.model_dump() for s in report.segment_data])
+    df["margin"] = df["operating_income"] / df["revenue"] * 100
+    return df[["segment_name", "revenue", "operating_income", "margin"]].rename(columns={
+        "segment_name": "Segment", "revenue": "Revenue",
+        "operating_income": "Operating Income", "margin": "Margin"
+    })
+
+@st.cache_data(show_spinner=False)
+def _geographic_table(report_json: str) -> pd.DataFrame:
+    """Geographic revenue table, built once per report"""
+    report = FinancialReport.model_validate_json(report_json)
+    geo = report.geographic_data
+    revenues = np.fromiter((g.revenue for g in geo), dtype=np.float64, count=len(geo))
+    return pd.DataFrame({
+        "Region": [g.region for g in geo],
+        "Revenue": revenues,
+        "% of Total": revenues / revenues.sum() * 100
+    })
+
+@st.cache_data(show_spinner=False)
+def _debt_table(report_json: str) -> pd.DataFrame:
+    """Debt maturity table, built once per report"""
+    report = FinancialReport.model_validate_json(report_json)
+    df = pd.DataFrame([d.model_dump() for d in report.debt_schedule])
+    return df[["year", "principal_due", "interest_rate"]].rename(columns={
+        "year": "Year", "principal_due": "Principal Due", "interest_rate": "Interest Rate"
+    })
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _render_pdf(report_json: str, params_json: str, simulation_json: str, critic_json: str, debate_json: str,
+                _simulation, _critic, _debate) -> bytes:
+    """PDF bytes memoized on every input: report, scenario, simulation aggregates, critic verdict and debate"""
+    return evaluator.render_pdf(_simulation, _critic, FinancialReport.model_validate_json(report_json), _debate)
+
+@st.cache_resource
+def get_extractions():
+    """Process-wide Landing AI worker pool plus in-flight/finished extractions keyed by PDF hash"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="landing-ai"), {}
+
+def submit_extraction(pdf_bytes: bytes, pdf_hash: str) -> Future:
+    """Start (or join) the extraction for this PDF; every session uploading it shares one API call"""
+    executor, futures = get_extractions()
+    future = futures.get(pdf_hash)
+    if future is None or (future.done() and future.exception() is not None):
+        future = futures[pdf_hash] = executor.submit(landing_client.extract_data_from_bytes, pdf_bytes)
+    return future
+
+@st.fragment(run_every=1)
+def extraction_status(future: Future):
+    """Poll the background extraction; rerun the page once the report is ready"""
+    if future.done():
+        st.rerun(scope="app")
+    st.status("Extracting Data from PDF using Landing AI...", state="running")
+
+def render_expense_section(report, report_json):
+    """Operating expense breakdown (R&D, SG&A, total OpEx)"""
+    st.markdown("### 💰 Operating Expense Breakdown")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if report.income_statement.RnD is not None:
+            st.markdown(METRIC_CARD.format_map({
+                "label": "R&D Spending", "color": "inherit",
+                "value": format_currency(report.income_statement.RnD),
+                "subtitle": f"{(report.income_statement.RnD / report.income_statement.Revenue * 100):.1f}% of revenue"
+            }), unsafe_allow_html=True)
+        else:
+            st.info("R&D data not available")
+
+    with col2:
+        if report.income_statement.SGA is not None:
+            st.markdown(METRIC_CARD.format_map({
+                "label": "SG&A Expenses", "color": "inherit",
+                "value": format_currency(report.income_statement.SGA),
+                "subtitle": f"{(report.income_statement.SGA / report.income_statement.Revenue * 100):.1f}% of revenue"
+            }), unsafe_allow_html=True)
+        else:
+            st.info("SG&A data not available")
+
+    with col3:
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Total OpEx", "color": "inherit",
+            "value": format_currency(report.income_statement.OpEx),
+            "subtitle": f"{(report.income_statement.OpEx / report.income_statement.Revenue * 100):.1f}% of revenue"
+        }), unsafe_allow_html=True)
+
+def render_cash_flow_section(report, report_json):
+    """Free cash flow, operating cash flow and FCF margin"""
+    st.markdown("### 💵 Cash Flow Metrics")
+    fcf_col1, fcf_col2, fcf_col3 = st.columns(3)
+
+    with fcf_col1:
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Free Cash Flow", "color": "var(--success)",
+            "value": format_currency(report.cash_flow.FreeCashFlow),
+            "subtitle": "CFO - CapEx"
+        }), unsafe_allow_html=True)
+
+    with fcf_col2:
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Cash from Operations", "color": "inherit",
+            "value": format_currency(report.cash_flow.CashFromOperations),
+            "subtitle": "Operating cash generation"
+        }), unsafe_allow_html=True)
+
+    with fcf_col3:
+        fcf_margin = (report.cash_flow.FreeCashFlow / report.income_statement.Revenue * 100) if report.income_statement.Revenue > 0 else 0
+        st.markdown(METRIC_CARD.format_map({
+            "label": "FCF Margin", "color": "var(--accent)",
+            "value": f"{fcf_margin:.1f}%",
+            "subtitle": "FCF as % of revenue"
+        }), unsafe_allow_html=True)
+
+def render_segment_section(report, report_json):
+    """Business unit revenue and margins"""
+    st.markdown("## 📊 Segment Performance")
+    st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">Business unit breakdown</p>', unsafe_allow_html=True)
+
+    # Create segment table
+    segment_df = _segment_table(report_json)
+    st.table(segment_df.style.format({
+        "Revenue": "${:,.0f}", "Operating Income": "${:,.0f}", "Margin": "{:.1f}%"
+    }, na_rep="N/A"))
+
+def render_geographic_section(report, report_json):
+    """Revenue by region"""
+    st.markdown("## 🌍 Geographic Distribution")
+    st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">Revenue by region</p>', unsafe_allow_html=True)
+
+    # Create geographic table
+    geo_df = _geographic_table(report_json)
+    st.table(geo_df.style.format({"Revenue": "${:,.0f}", "% of Total": "{:.1f}%"}))
+
+def render_debt_section(report, report_json):
+    """Debt maturity schedule and leverage"""
+    st.markdown("## 📅 Debt Maturity Schedule")
+    st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">Upcoming debt obligations</p>', unsafe_allow_html=True)
+
+    # Create debt schedule table
+    debt_df = _debt_table(report_json)
+    st.table(debt_df.style.format({
+        "Principal Due": "${:,.0f}", "Interest Rate": "{:.2f}%"
+    }, na_rep="N/A"))
+
+    # Show debt ratios if balance sheet data available
+    if report.balance_sheet.LongTermDebt:
+        debt_to_ebitda = report.balance_sheet.LongTermDebt / report.income_statement.EBITDA if report.income_statement.EBITDA > 0 else 0
+        st.metric("Debt-to-EBITDA Ratio", f"{debt_to_ebitda:.2f}x")
+
+def render_forward_looking_section(report, report_json):
+    """Guidance, MD&A commentary and risk factors"""
+    st.markdown("## 🔮 Forward-Looking Insights")
+    st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">MD&A commentary and guidance</p>', unsafe_allow_html=True)
+
+    if report.forward_looking.revenue_guidance:
+        st.markdown(f"**📈 Revenue Guidance**: {report.forward_looking.revenue_guidance}")
+
+    if report.forward_looking.mda_commentary:
+        with st.expander("💬 Management Discussion & Analysis"):
+            st.write(report.forward_looking.mda_commentary)
+
+    if report.forward_looking.risk_factors:
+        with st.expander("⚠️ Risk Factors"):
+            st.markdown("\n".join(f"- {risk}" for risk in report.forward_looking.risk_factors))
+
+    if report.forward_looking.commitments:
+        st.metric("Commitments & Contingencies", f"${report.forward_looking.commitments:,.0f}")
+
+def render_non_gaap_section(report, report_json):
+    """Adjusted metrics and GAAP reconciliation"""
+    st.markdown("## 🔢 Non-GAAP Metrics")
+    st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">Adjusted financial metrics</p>', unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if report.non_gaap_metrics.adjusted_ebitda:
+            st.metric("Adjusted EBITDA", f"${report.non_gaap_metrics.adjusted_ebitda:,.0f}")
+
+    with col2:
+        if report.non_gaap_metrics.adjusted_net_income:
+            st.metric("Adjusted Net Income", f"${report.non_gaap_metrics.adjusted_net_income:,.0f}")
+
+    with col3:
+        if report.non_gaap_metrics.sbc_expense:
+            st.metric("Stock-Based Comp", f"${report.non_gaap_metrics.sbc_expense:,.0f}")
+
+    if report.non_gaap_metrics.reconciliation_items:
+        with st.expander("🔄 GAAP to Non-GAAP Reconciliation"):
+            for item, value in report.non_gaap_metrics.reconciliation_items.items():
+                st.write(f"**{item}**: ${value:,.0f}")
+
+@st.fragment
+def render_debate(report, report_json, simulation_results, critic_verdict):
+    """Debate panel and PDF export; reruns on its own so a debate doesn't redraw the dashboard"""
+    # === NEW: AI ANALYST DEBATE SECTION ===
+    st.markdown("## 💬 AI Analyst Debate")
+    st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1.5rem;">Two AI analysts debate the analysis • Converges when agreement is reached</p>', unsafe_allow_html=True)
+
+    # Initialize debate result in session state
+    if 'debate_result' not in st.session_state:
+        st.session_state.debate_result = None
+
+    # Debate trigger button
+    if st.button("🎙️ Start AI Debate", type="secondary"):
+        try:
+            with st.spinner("🤖 AI analysts are debating... This may take 30-60 seconds"):
+                async def debate():
+                    # Initialize Debate Agent (its connection pool is closed on exit).
+                    # Debates for the same scenario are replayed from its cache; ones for
+                    # nearby params only with "Reuse nearby debates" ticked.
+                    async with DebateAgent(
+                        openai_api_key=OPENAI_API_KEY,
+                        deepseek_api_key=DEEPSEEK_API_KEY
+                    ) as debate_agent:
+                        return await debate_agent.arun_debate(
+                            report=report,
+                            simulation=st.session_state.simulation_results,
+                            params=st.session_state.params,  # Use params from session state
+                            max_rounds=10,
+                            use_cache=not st.session_state.get("force_fresh"),
+                            semantic_cache=st.session_state.get("semantic_cache", False)
+                        )
+            
+                st.session_state.debate_result = asyncio.run(debate())
+
+            st.success(f"✅ Debate completed in {st.session_state.debate_result.total_rounds} rounds!")
+        
+        except Exception as e:
+            st.error(f"❌ Error during debate: {str(e)}")
+            st.exception(e)
+
+    # Display debate if it exists
+    if st.session_state.debate_result is not None:
+        debate = st.session_state.debate_result
     
-    rev_growth_delta = st.slider("Revenue Growth Delta", -500, 500, 0, help="Basis points change in revenue growth")
-    st.markdown(f'<div style="text-align: right; margin-top: -1rem; margin-bottom: 0.5rem;"><span class="mono" style="color: var(--success); font-size: 0.875rem;">{rev_growth_delta:+d} bps</span></div>', unsafe_allow_html=True)
+        # Convergence status
+        if debate.converged:
+            st.markdown(f"""
+            <div class="status-badge success" style="margin-bottom: 1rem;">
+                <span>✅ CONVERGED (Round {debate.convergence_round})</span>
+            </div>
+            """, unsafe_allow_html=True)
+        elif debate.stop_reason == "one_sided":
+            st.markdown(f"""
+            <div class="status-badge warning" style="margin-bottom: 1rem;">
+                <span>⚠️ STOPPED EARLY: ONE-SIDED DEBATE ({debate.total_rounds} rounds)</span>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="status-badge warning" style="margin-bottom: 1rem;">
+                <span>⚠️ NO FULL CONVERGENCE ({debate.total_rounds} rounds)</span>
+            </div>
+            """, unsafe_allow_html=True)
     
-    discount_rate_delta = st.slider("Discount Rate Delta", -500, 500, 0, help="Basis points change in discount rate")
-    st.markdown(f'<div style="text-align: right; margin-top: -1rem; margin-bottom: 0.5rem;"><span class="mono" style="color: var(--warning); font-size: 0.875rem;">{discount_rate_delta:+d} bps</span></div>', unsafe_allow_html=True)
+        # Debate transcript
+        with st.expander("📜 View Full Debate Transcript", expanded=True):
+            transcript_html = []
+            for turn in debate.debate_log:
+                # Determine color based on speaker
+                if turn.speaker == "OpenAI":
+                    bg_color = "rgba(16, 185, 129, 0.1)"  # Green tint
+                    border_color = "#10B981"
+                    icon = "🟢"
+                else:
+                    bg_color = "rgba(239, 68, 68, 0.1)"  # Red tint
+                    border_color = "#EF4444"
+                    icon = "🔴"
+                message = turn.message.replace('$', '\\$')
+            
+                transcript_html.append(f"""
+                <div style="
+                    background: {bg_color};
+                    border-left: 3px solid {border_color};
+                    border-radius: 0.5rem;
+                    padding: 1rem;
+                    margin-bottom: 0.75rem;
+                ">
+                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+                        <strong style="font-size: 0.875rem; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">{icon} {turn.speaker} ({turn.role})</strong>
+                        <span style="font-size: 0.75rem; color: var(--muted-foreground); font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">Round {turn.round_number}</span>
+                    </div>
+                    <p style="margin: 0; font-size: 0.875rem; line-height: 1.6; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; white-space: pre-wrap;">{message}</p>
+                </div>
+                """)
+            
+            # One markdown call for the whole transcript instead of one per turn
+            st.markdown("".join(transcript_html), unsafe_allow_html=True)
     
-    st.markdown("---")
+        # Consensus summary
+        st.markdown("### 🎯 Consensus Summary")
+        st.markdown(debate.consensus_summary.replace('$', '\$'))
     
-    # Action Buttons
-    run_btn = st.button("▶️ Run Analysis", use_container_width=True, type="primary")
-
-# Main Content
-st.markdown("""
-<div class="main-header">
-    <div style="display: flex; align-items: center; gap: 0.75rem; margin-bottom: 0.25rem;">
-        <h1>Analysis Dashboard</h1>
-        <div class="status-badge success">
-            <span style="font-size: 0.625rem;">●</span>
-            <span>LIVE</span>
+        # Final verdict
+        st.markdown(f"""
+        <div class="metric-card" style="text-align: center; margin-top: 1rem;">
+            <p class="metric-label">FINAL INVESTMENT VERDICT</p>
+            <p class="metric-value" style="font-size: 2rem;">{debate.final_verdict}</p>
+            <p class="metric-subtitle">Confidence: {debate.confidence_level}</p>
         </div>
-    </div>
-    <p>Real-time financial modeling • Scenario analysis • Risk assessment</p>
-</div>
-""", unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
 
-# Main Area
-# Initialize Agents (moved here to be available for upload section)
-landing_client = LandingAIClient(api_key=os.getenv("LANDINGAI_API_KEY"))
-simulator = SimulatorAgent(api_key=os.getenv("GEMINI_API_KEY"))
-critic = CriticAgent(api_key=os.getenv("DEEPSEEK_API_KEY"))
-evaluator = EvaluatorAgent()
+    # 4. Final Report
+    st.markdown("## 📄 Report Generation")
+    # Rendered on click (in memory, no temp file) and memoized, so repeat downloads are free
+    debate_data = st.session_state.get('debate_result', None)
+    params_json = st.session_state.params.model_dump_json()
+    debate_json = debate_data.model_dump_json() if debate_data else ""
+    # The per-path runs are bulky; the aggregates identify the simulation well enough
+    simulation_json = simulation_results.model_dump_json(exclude={'simulation_runs'})
+    critic_json = critic_verdict.model_dump_json()
+    st.download_button(
+        label="📥 Download PDF Report",
+        data=lambda: _render_pdf(report_json, params_json, simulation_json, critic_json, debate_json,
+                                 simulation_results, critic_verdict, debate_data),
+        file_name="counterfactual_report.pdf",
+        mime="application/pdf",
+        type="primary",
+        use_container_width=True
+    )
 
 # File Upload Section
 st.markdown("## 📤 Upload Financial Document")
@@ -123,31 +579,38 @@ with upload_tab1:
     uploaded_file = st.file_uploader("", type=["pdf"], key="pdf_uploader", label_visibility="collapsed")
     
     if uploaded_file is not None:
-        # Save uploaded file temporarily
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        temp_pdf_path = os.path.join(temp_dir, uploaded_file.name)
-        with open(temp_pdf_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        pdf_bytes = uploaded_file.getvalue()
+        pdf_hash = hashlib.blake2b(pdf_bytes).hexdigest()
         
-        # 1. Extraction
-        with st.spinner("Extracting Data from PDF using Landing AI..."):
-            try:
-                report = landing_client.extract_data(temp_pdf_path)
-                st.success("✅ Data extracted successfully!")
-                
-                # Display Extraction Metrics
-                if report.pdf_metadata:
-                    m_col1, m_col2, m_col3 = st.columns(3)
-                    with m_col1:
-                        st.metric("Processing Time", f"{report.pdf_metadata.duration_ms/1000:.1f}s")
-                    with m_col2:
-                        st.metric("Pages Processed", report.pdf_metadata.page_count)
-                    with m_col3:
-                        st.metric("Credits Used", f"{report.pdf_metadata.credit_usage:.1f}")
-            except Exception as e:
-                st.error(f"Error extracting data: {str(e)}")
-                st.stop()
+        if st.session_state.get("report_hash") == pdf_hash:
+            # Same document as the previous rerun - skip extraction entirely
+            report = st.session_state.report
+        else:
+            # 1. Extraction runs on a worker thread so the page stays responsive while it's in flight
+            future = submit_extraction(pdf_bytes, pdf_hash)
+            if not future.done():
+                extraction_status(future)
+            else:
+                try:
+                    report = future.result()
+                    st.session_state.report_hash = pdf_hash
+                    st.session_state.report = report
+                except Exception as e:
+                    st.error(f"Error extracting data: {str(e)}")
+                    st.stop()
+        
+        if report is not None:
+            st.success("✅ Data extracted successfully!")
+        
+        # Display Extraction Metrics
+        if report is not None and report.pdf_metadata:
+            m_col1, m_col2, m_col3 = st.columns(3)
+            with m_col1:
+                st.metric("Processing Time", f"{report.pdf_metadata.duration_ms/1000:.1f}s")
+            with m_col2:
+                st.metric("Pages Processed", report.pdf_metadata.page_count)
+            with m_col3:
+                st.metric("Credits Used", f"{report.pdf_metadata.credit_usage:.1f}")
 
 with upload_tab2:
     st.markdown("**Upload a pre-extracted JSON file** to skip Landing AI API call")
@@ -157,7 +620,6 @@ with upload_tab2:
     
     if uploaded_json is not None:
         try:
-            import json
             json_data = json.load(uploaded_json)
             
             # Check if this is a raw Landing AI response (has 'markdown' field)
@@ -183,6 +645,9 @@ with upload_tab2:
 
 # Only proceed if we have a report from either source
 if report is not None:
+    # Serialized once per rerun; used as the cache key for per-report work
+    report_json = report.model_dump_json()
+    
     # Data Sources Sidebar
     with st.sidebar:
         st.markdown("---")
@@ -195,16 +660,19 @@ if report is not None:
             "Total Assets": f"${report.balance_sheet.Assets.get('TotalAssets', 0):,.0f}"
         }
         
-        for field, value in sources.items():
-            with st.expander(f"**{field}**: {value}"):
-                source_info = report.index.get(field, "Extracted from financial data")
-                st.write(f"📍 **Source**: {source_info}")
+        # One table instead of an expander per field
+        st.dataframe(pd.DataFrame({
+            "Field": list(sources),
+            "Value": list(sources.values()),
+            "Source": [report.index.get(field, "Extracted from financial data") for field in sources]
+        }), hide_index=True, use_container_width=True)
         
-        st.caption("💡 Hover over each field to see document source")
+        st.caption("💡 Hover over a Source cell to see the full document reference")
 
     # Extracted Data
-    with st.expander("📊 View Extracted Financial Data"):
-        st.json(report.model_dump())
+    with st.expander("📊 View Extracted Financial Data", expanded=False):
+        # Reuse the already-serialized report instead of dumping to a dict for Streamlit to re-encode
+        st.json(report_json)
 
     # === COMPREHENSIVE FINANCIAL METRICS SECTION ===
     st.markdown("## 📈 Comprehensive Financial Metrics")
@@ -237,43 +705,35 @@ if report is not None:
     
     with prof_col1:
         gross_margin = (gross_profit / revenue * 100) if revenue > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Gross Margin</p>
-            <p class="metric-value" style="color: var(--success);">{gross_margin:.1f}%</p>
-            <p class="metric-subtitle">Gross Profit / Revenue</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Gross Margin", "color": "var(--success)",
+            "value": f"{gross_margin:.1f}%",
+            "subtitle": "Gross Profit / Revenue"
+        }), unsafe_allow_html=True)
     
     with prof_col2:
         operating_margin = (ebit / revenue * 100) if revenue > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Operating Margin</p>
-            <p class="metric-value" style="color: var(--accent);">{operating_margin:.1f}%</p>
-            <p class="metric-subtitle">EBIT / Revenue</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Operating Margin", "color": "var(--accent)",
+            "value": f"{operating_margin:.1f}%",
+            "subtitle": "EBIT / Revenue"
+        }), unsafe_allow_html=True)
     
     with prof_col3:
         ebitda_margin = (ebitda / revenue * 100) if revenue > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">EBITDA Margin</p>
-            <p class="metric-value" style="color: var(--primary);">{ebitda_margin:.1f}%</p>
-            <p class="metric-subtitle">EBITDA / Revenue</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "EBITDA Margin", "color": "var(--primary)",
+            "value": f"{ebitda_margin:.1f}%",
+            "subtitle": "EBITDA / Revenue"
+        }), unsafe_allow_html=True)
     
     with prof_col4:
         net_margin = (net_income / revenue * 100) if revenue > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Net Margin</p>
-            <p class="metric-value" style="color: var(--warning);">{net_margin:.1f}%</p>
-            <p class="metric-subtitle">Net Income / Revenue</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Net Margin", "color": "var(--warning)",
+            "value": f"{net_margin:.1f}%",
+            "subtitle": "Net Income / Revenue"
+        }), unsafe_allow_html=True)
     
     # Return Ratios
     st.markdown("### 📊 Return Ratios")
@@ -281,33 +741,27 @@ if report is not None:
     
     with return_col1:
         roe = (net_income / total_equity * 100) if total_equity > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Return on Equity (ROE)</p>
-            <p class="metric-value" style="color: var(--success);">{roe:.1f}%</p>
-            <p class="metric-subtitle">Net Income / Equity</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Return on Equity (ROE)", "color": "var(--success)",
+            "value": f"{roe:.1f}%",
+            "subtitle": "Net Income / Equity"
+        }), unsafe_allow_html=True)
     
     with return_col2:
         roa = (net_income / total_assets * 100) if total_assets > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Return on Assets (ROA)</p>
-            <p class="metric-value" style="color: var(--accent);">{roa:.1f}%</p>
-            <p class="metric-subtitle">Net Income / Assets</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Return on Assets (ROA)", "color": "var(--accent)",
+            "value": f"{roa:.1f}%",
+            "subtitle": "Net Income / Assets"
+        }), unsafe_allow_html=True)
     
     with return_col3:
         roic = (ebit / (total_assets - cash) * 100) if (total_assets - cash) > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">ROIC</p>
-            <p class="metric-value" style="color: var(--primary);">{roic:.1f}%</p>
-            <p class="metric-subtitle">EBIT / (Assets - Cash)</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "ROIC", "color": "var(--primary)",
+            "value": f"{roic:.1f}%",
+            "subtitle": "EBIT / (Assets - Cash)"
+        }), unsafe_allow_html=True)
     
     # Leverage Ratios
     st.markdown("### ⚖️ Leverage & Debt Ratios")
@@ -315,43 +769,35 @@ if report is not None:
     
     with lev_col1:
         debt_to_equity = (total_debt / total_equity) if total_equity > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Debt-to-Equity</p>
-            <p class="metric-value" style="color: var(--warning);">{debt_to_equity:.2f}x</p>
-            <p class="metric-subtitle">Total Debt / Equity</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Debt-to-Equity", "color": "var(--warning)",
+            "value": f"{debt_to_equity:.2f}x",
+            "subtitle": "Total Debt / Equity"
+        }), unsafe_allow_html=True)
     
     with lev_col2:
         debt_to_assets = (total_debt / total_assets) if total_assets > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Debt-to-Assets</p>
-            <p class="metric-value" style="color: var(--warning);">{debt_to_assets:.2f}x</p>
-            <p class="metric-subtitle">Total Debt / Assets</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Debt-to-Assets", "color": "var(--warning)",
+            "value": f"{debt_to_assets:.2f}x",
+            "subtitle": "Total Debt / Assets"
+        }), unsafe_allow_html=True)
     
     with lev_col3:
         debt_to_ebitda = (total_debt / ebitda) if ebitda > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Debt-to-EBITDA</p>
-            <p class="metric-value" style="color: var(--warning);">{debt_to_ebitda:.2f}x</p>
-            <p class="metric-subtitle">Total Debt / EBITDA</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Debt-to-EBITDA", "color": "var(--warning)",
+            "value": f"{debt_to_ebitda:.2f}x",
+            "subtitle": "Total Debt / EBITDA"
+        }), unsafe_allow_html=True)
     
     with lev_col4:
         equity_ratio = (total_equity / total_assets * 100) if total_assets > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Equity Ratio</p>
-            <p class="metric-value" style="color: var(--success);">{equity_ratio:.1f}%</p>
-            <p class="metric-subtitle">Equity / Assets</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Equity Ratio", "color": "var(--success)",
+            "value": f"{equity_ratio:.1f}%",
+            "subtitle": "Equity / Assets"
+        }), unsafe_allow_html=True)
     
     # Liquidity Ratios
     st.markdown("### 💧 Liquidity Ratios")
@@ -362,33 +808,27 @@ if report is not None:
     
     with liq_col1:
         current_ratio = (current_assets / current_liabilities) if current_liabilities > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Current Ratio</p>
-            <p class="metric-value" style="color: var(--accent);">{current_ratio:.2f}x</p>
-            <p class="metric-subtitle">Current Assets / Current Liabilities</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Current Ratio", "color": "var(--accent)",
+            "value": f"{current_ratio:.2f}x",
+            "subtitle": "Current Assets / Current Liabilities"
+        }), unsafe_allow_html=True)
     
     with liq_col2:
         quick_ratio = ((cash + ar) / current_liabilities) if current_liabilities > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Quick Ratio</p>
-            <p class="metric-value" style="color: var(--accent);">{quick_ratio:.2f}x</p>
-            <p class="metric-subtitle">(Cash + AR) / Current Liabilities</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Quick Ratio", "color": "var(--accent)",
+            "value": f"{quick_ratio:.2f}x",
+            "subtitle": "(Cash + AR) / Current Liabilities"
+        }), unsafe_allow_html=True)
     
     with liq_col3:
         cash_ratio = (cash / current_liabilities) if current_liabilities > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Cash Ratio</p>
-            <p class="metric-value" style="color: var(--accent);">{cash_ratio:.2f}x</p>
-            <p class="metric-subtitle">Cash / Current Liabilities</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Cash Ratio", "color": "var(--accent)",
+            "value": f"{cash_ratio:.2f}x",
+            "subtitle": "Cash / Current Liabilities"
+        }), unsafe_allow_html=True)
     
     # Coverage Ratios
     st.markdown("### 🛡️ Coverage Ratios")
@@ -397,24 +837,20 @@ if report is not None:
     with cov_col1:
         interest_coverage = (ebit / income_stmt.InterestExpense) if income_stmt.InterestExpense > 0 else float('inf')
         coverage_display = f"{interest_coverage:.2f}x" if interest_coverage != float('inf') else "N/A"
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Interest Coverage</p>
-            <p class="metric-value" style="color: var(--success);">{coverage_display}</p>
-            <p class="metric-subtitle">EBIT / Interest Expense</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Interest Coverage", "color": "var(--success)",
+            "value": coverage_display,
+            "subtitle": "EBIT / Interest Expense"
+        }), unsafe_allow_html=True)
     
     with cov_col2:
         if cf.FreeCashFlow and total_debt > 0:
             fcf_to_debt = cf.FreeCashFlow / total_debt
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">FCF to Debt</p>
-                <p class="metric-value" style="color: var(--success);">{fcf_to_debt:.2f}x</p>
-                <p class="metric-subtitle">Free Cash Flow / Total Debt</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(METRIC_CARD.format_map({
+                "label": "FCF to Debt", "color": "var(--success)",
+                "value": f"{fcf_to_debt:.2f}x",
+                "subtitle": "Free Cash Flow / Total Debt"
+            }), unsafe_allow_html=True)
         else:
             st.info("FCF to Debt: Data not available")
     
@@ -424,25 +860,21 @@ if report is not None:
     
     with eff_col1:
         asset_turnover = (revenue / total_assets) if total_assets > 0 else 0
-        st.markdown(f"""
-        <div class="metric-card">
-            <p class="metric-label">Asset Turnover</p>
-            <p class="metric-value" style="color: var(--primary);">{asset_turnover:.2f}x</p>
-            <p class="metric-subtitle">Revenue / Assets</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(METRIC_CARD.format_map({
+            "label": "Asset Turnover", "color": "var(--primary)",
+            "value": f"{asset_turnover:.2f}x",
+            "subtitle": "Revenue / Assets"
+        }), unsafe_allow_html=True)
     
     with eff_col2:
         if inventory > 0:
             # Approximate inventory turnover (using COGS)
             inventory_turnover = (income_stmt.CostOfGoodsSold / inventory) if inventory > 0 else 0
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">Inventory Turnover</p>
-                <p class="metric-value" style="color: var(--primary);">{inventory_turnover:.2f}x</p>
-                <p class="metric-subtitle">COGS / Inventory</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(METRIC_CARD.format_map({
+                "label": "Inventory Turnover", "color": "var(--primary)",
+                "value": f"{inventory_turnover:.2f}x",
+                "subtitle": "COGS / Inventory"
+            }), unsafe_allow_html=True)
         else:
             st.info("Inventory Turnover: Data not available")
     
@@ -450,13 +882,11 @@ if report is not None:
         if ar > 0:
             # Days Sales Outstanding (approximate)
             dso = (ar / revenue * 365) if revenue > 0 else 0
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">Days Sales Outstanding</p>
-                <p class="metric-value" style="color: var(--primary);">{dso:.0f} days</p>
-                <p class="metric-subtitle">(AR / Revenue) × 365</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(METRIC_CARD.format_map({
+                "label": "Days Sales Outstanding", "color": "var(--primary)",
+                "value": f"{dso:.0f} days",
+                "subtitle": "(AR / Revenue) × 365"
+            }), unsafe_allow_html=True)
         else:
             st.info("DSO: Data not available")
     
@@ -527,181 +957,26 @@ if report is not None:
                 else:
                     st.metric(kpi_name, str(kpi_value))
 
-    # === ENHANCED TIER 1 DATA DISPLAY ===
-
-    # Expense Breakdown (if R&D and SG&A are available)
-    if report.income_statement.RnD is not None or report.income_statement.SGA is not None:
-        st.markdown("### 💰 Operating Expense Breakdown")
-        col1, col2, col3 = st.columns(3)
-    
-        with col1:
-            if report.income_statement.RnD is not None:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <p class="metric-label">R&D Spending</p>
-                    <p class="metric-value">{format_currency(report.income_statement.RnD)}</p>
-                    <p class="metric-subtitle">{(report.income_statement.RnD / report.income_statement.Revenue * 100):.1f}% of revenue</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("R&D data not available")
-    
-        with col2:
-            if report.income_statement.SGA is not None:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <p class="metric-label">SG&A Expenses</p>
-                    <p class="metric-value">{format_currency(report.income_statement.SGA)}</p>
-                    <p class="metric-subtitle">{(report.income_statement.SGA / report.income_statement.Revenue * 100):.1f}% of revenue</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("SG&A data not available")
-    
-        with col3:
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">Total OpEx</p>
-                <p class="metric-value">{format_currency(report.income_statement.OpEx)}</p>
-                <p class="metric-subtitle">{(report.income_statement.OpEx / report.income_statement.Revenue * 100):.1f}% of revenue</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-    # Free Cash Flow (always show since it's Tier 1)
-    if report.cash_flow.FreeCashFlow is not None:
-        st.markdown("### 💵 Cash Flow Metrics")
-        fcf_col1, fcf_col2, fcf_col3 = st.columns(3)
-    
-        with fcf_col1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">Free Cash Flow</p>
-                <p class="metric-value" style="color: var(--success);">{format_currency(report.cash_flow.FreeCashFlow)}</p>
-                <p class="metric-subtitle">CFO - CapEx</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-        with fcf_col2:
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">Cash from Operations</p>
-                <p class="metric-value">{format_currency(report.cash_flow.CashFromOperations)}</p>
-                <p class="metric-subtitle">Operating cash generation</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-        with fcf_col3:
-            fcf_margin = (report.cash_flow.FreeCashFlow / report.income_statement.Revenue * 100) if report.income_statement.Revenue > 0 else 0
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">FCF Margin</p>
-                <p class="metric-value" style="color: var(--accent);">{fcf_margin:.1f}%</p>
-                <p class="metric-subtitle">FCF as % of revenue</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-    # === TIER 2: ADVANCED FORECASTING DATA ===
-
-    # Segment Analysis (if available)
-    if report.segment_data and len(report.segment_data) > 0:
-        st.markdown("## 📊 Segment Performance")
-        st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">Business unit breakdown</p>', unsafe_allow_html=True)
-    
-        # Create segment table
-        segment_df = []
-        for segment in report.segment_data:
-            segment_df.append({
-                "Segment": segment.segment_name,
-                "Revenue": f"${segment.revenue:,.0f}",
-                "Operating Income": f"${segment.operating_income:,.0f}" if segment.operating_income else "N/A",
-                "Margin": f"{(segment.operating_income / segment.revenue * 100):.1f}%" if segment.operating_income else "N/A"
-            })
-    
-        st.table(segment_df)
-
-    # Geographic Breakdown (if available)
-    if report.geographic_data and len(report.geographic_data) > 0:
-        st.markdown("## 🌍 Geographic Distribution")
-        st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">Revenue by region</p>', unsafe_allow_html=True)
-    
-        # Create geographic table
-        geo_df = []
-        total_geo_revenue = sum(g.revenue for g in report.geographic_data)
-        for geo in report.geographic_data:
-            geo_df.append({
-                "Region": geo.region,
-                "Revenue": f"${geo.revenue:,.0f}",
-                "% of Total": f"{(geo.revenue / total_geo_revenue * 100):.1f}%"
-            })
-    
-        st.table(geo_df)
-
-    # Debt Analysis (if debt schedule available)
-    if report.debt_schedule and len(report.debt_schedule) > 0:
-        st.markdown("## 📅 Debt Maturity Schedule")
-        st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">Upcoming debt obligations</p>', unsafe_allow_html=True)
-    
-        # Create debt schedule table
-        debt_df = []
-        for debt in report.debt_schedule:
-            debt_df.append({
-                "Year": debt.year,
-                "Principal Due": f"${debt.principal_due:,.0f}",
-                "Interest Rate": f"{debt.interest_rate:.2f}%" if debt.interest_rate else "N/A"
-            })
-    
-        st.table(debt_df)
-    
-        # Show debt ratios if balance sheet data available
-        if report.balance_sheet.LongTermDebt:
-            debt_to_ebitda = report.balance_sheet.LongTermDebt / report.income_statement.EBITDA if report.income_statement.EBITDA > 0 else 0
-            st.metric("Debt-to-EBITDA Ratio", f"{debt_to_ebitda:.2f}x")
-
-    # Forward-Looking Insights (if available)
-    if report.forward_looking:
-        st.markdown("## 🔮 Forward-Looking Insights")
-        st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">MD&A commentary and guidance</p>', unsafe_allow_html=True)
-    
-        if report.forward_looking.revenue_guidance:
-            st.markdown(f"**📈 Revenue Guidance**: {report.forward_looking.revenue_guidance}")
-    
-        if report.forward_looking.mda_commentary:
-            with st.expander("💬 Management Discussion & Analysis"):
-                st.write(report.forward_looking.mda_commentary)
-    
-        if report.forward_looking.risk_factors:
-            with st.expander("⚠️ Risk Factors"):
-                for risk in report.forward_looking.risk_factors:
-                    st.markdown(f"- {risk}")
-    
-        if report.forward_looking.commitments:
-            st.metric("Commitments & Contingencies", f"${report.forward_looking.commitments:,.0f}")
-
-    # === TIER 3: ADVANCED METRICS ===
-
-    # Non-GAAP Metrics (if available)
-    if report.non_gaap_metrics:
-        st.markdown("## 🔢 Non-GAAP Metrics")
-        st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1rem;">Adjusted financial metrics</p>', unsafe_allow_html=True)
-    
-        col1, col2, col3 = st.columns(3)
-    
-        with col1:
-            if report.non_gaap_metrics.adjusted_ebitda:
-                st.metric("Adjusted EBITDA", f"${report.non_gaap_metrics.adjusted_ebitda:,.0f}")
-    
-        with col2:
-            if report.non_gaap_metrics.adjusted_net_income:
-                st.metric("Adjusted Net Income", f"${report.non_gaap_metrics.adjusted_net_income:,.0f}")
-    
-        with col3:
-            if report.non_gaap_metrics.sbc_expense:
-                st.metric("Stock-Based Comp", f"${report.non_gaap_metrics.sbc_expense:,.0f}")
-    
-        if report.non_gaap_metrics.reconciliation_items:
-            with st.expander("🔄 GAAP to Non-GAAP Reconciliation"):
-                for item, value in report.non_gaap_metrics.reconciliation_items.items():
-                    st.write(f"**{item}**: ${value:,.0f}")
+    # === TIER 1-3 DETAIL SECTIONS ===
+    # One tab per section the report actually has; only the open tab renders on a rerun
+    sections = [
+        (label, render) for label, render, present in (
+            ("💰 Expenses", render_expense_section,
+             report.income_statement.RnD is not None or report.income_statement.SGA is not None),
+            ("💵 Cash Flow", render_cash_flow_section, report.cash_flow.FreeCashFlow is not None),
+            ("📊 Segments", render_segment_section, bool(report.segment_data)),
+            ("🌍 Geography", render_geographic_section, bool(report.geographic_data)),
+            ("📅 Debt", render_debt_section, bool(report.debt_schedule)),
+            ("🔮 Outlook", render_forward_looking_section, bool(report.forward_looking)),
+            ("🔢 Non-GAAP", render_non_gaap_section, bool(report.non_gaap_metrics)),
+        ) if present
+    ]
+    if sections:
+        tabs = st.tabs([label for label, _ in sections], key="report_sections", on_change="rerun")
+        for tab, (_, render) in zip(tabs, sections):
+            if tab.open:
+                with tab:
+                    render(report, report_json)
 
     # Initialize session state for simulation results
     if 'simulation_results' not in st.session_state:
@@ -711,23 +986,22 @@ if report is not None:
     if 'params' not in st.session_state:
         st.session_state.params = None
     
-    if run_btn:
-        params = ScenarioParams(
-            opex_delta_bps=opex_delta,
-            revenue_growth_bps=rev_growth_delta,
-            discount_rate_bps=discount_rate_delta
-        )
+    if st.session_state.pop("run_requested", False):
+        params = st.session_state.scenario
     
         # Store params in session state for debate access
         st.session_state.params = params
     
-        # 2. Simulation
-        with st.spinner("Running Monte Carlo Simulation..."):
-            st.session_state.simulation_results = simulator.run_simulation(report, params)
-        
-        # 3. Critique
-        with st.spinner("DeepSeek is reviewing the report..."):
-            st.session_state.critic_verdict = critic.critique(report, st.session_state.simulation_results)
+        # 2. Simulation + 3. Critique (critic pre-work overlaps the simulation)
+        with st.spinner("Running Monte Carlo Simulation and DeepSeek review..."):
+            if st.session_state.get("force_fresh"):
+                results, verdict = asyncio.run(gather_analysis(
+                    report, params, scenario_key(report_json, params), force_fresh=True
+                ))
+            else:
+                results, verdict = _cached_analysis(report_json, params.model_dump_json())
+            st.session_state.simulation_results = results
+            st.session_state.critic_verdict = verdict
 
     # Display results if they exist in session state
     if st.session_state.simulation_results is not None:
@@ -742,36 +1016,29 @@ if report is not None:
         col1, col2, col3 = st.columns(3)
     
         with col1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">Projected NPV</p>
-                <p class="metric-value">{format_currency(simulation_results.median_npv)}</p>
-                <p class="metric-subtitle">Net Present Value @ 8.5% discount</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(METRIC_CARD.format_map({
+                "label": "Projected NPV", "color": "inherit",
+                "value": format_currency(simulation_results.median_npv),
+                "subtitle": "Net Present Value @ 8.5% discount"
+            }), unsafe_allow_html=True)
     
         with col2:
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">Median Revenue</p>
-                <p class="metric-value" style="color: var(--success);">{format_currency(simulation_results.median_revenue)}</p>
-                <p class="metric-subtitle">Projected annual revenue</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(METRIC_CARD.format_map({
+                "label": "Median Revenue", "color": "var(--success)",
+                "value": format_currency(simulation_results.median_revenue),
+                "subtitle": "Projected annual revenue"
+            }), unsafe_allow_html=True)
     
         with col3:
-            st.markdown(f"""
-            <div class="metric-card">
-                <p class="metric-label">Median EBITDA</p>
-                <p class="metric-value" style="color: var(--accent);">{format_currency(simulation_results.median_ebitda)}</p>
-                <p class="metric-subtitle">Earnings before interest, tax, D&A</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(METRIC_CARD.format_map({
+                "label": "Median EBITDA", "color": "var(--accent)",
+                "value": format_currency(simulation_results.median_ebitda),
+                "subtitle": "Earnings before interest, tax, D&A"
+            }), unsafe_allow_html=True)
     
         # Assumptions
         st.markdown("### 📋 Model Assumptions")
-        for log in simulation_results.assumption_log:
-            st.markdown(f"- {log}")
+        st.markdown("\n".join(f"- {log}" for log in simulation_results.assumption_log))
     
         # === ADVERSARIAL ANALYSIS SECTION ===
         st.markdown("## 🛡️ Adversarial Analysis")
@@ -787,168 +1054,20 @@ if report is not None:
     
         # Comparative Analysis
         st.markdown("**Comparative Analysis:**")
-        for point in critic_verdict.comparative_analysis:
-            st.markdown(f"""
+        st.markdown("".join(f"""
             <div class="critique-item pass">
                 <p style="margin: 0; font-size: 0.875rem;">{point}</p>
             </div>
-            """, unsafe_allow_html=True)
+            """ for point in critic_verdict.comparative_analysis), unsafe_allow_html=True)
     
         # Balance Sheet Check
         with st.expander("📊 Balance Sheet Validation"):
             st.json(critic_verdict.balance_sheet_check)
     
-        # === NEW: AI ANALYST DEBATE SECTION ===
-        st.markdown("## 💬 AI Analyst Debate")
-        st.markdown('<p style="font-size: 0.875rem; color: var(--muted-foreground); margin-bottom: 1.5rem;">Two AI analysts debate the analysis • Converges when agreement is reached</p>', unsafe_allow_html=True)
-    
-        # Initialize debate result in session state
-        if 'debate_result' not in st.session_state:
-            st.session_state.debate_result = None
-    
-        # Debate trigger button
-        if st.button("🎙️ Start AI Debate", type="secondary"):
-            try:
-                with st.spinner("🤖 AI analysts are debating... This may take 30-60 seconds"):
-                    from src.agents.debate_agent import DebateAgent
-                
-                    # Initialize Debate Agent
-                    debate_agent = DebateAgent(
-                        openai_api_key=os.getenv("OPENAI_API_KEY"),
-                        deepseek_api_key=os.getenv("DEEPSEEK_API_KEY")
-                    )
-                
-                    st.session_state.debate_result = debate_agent.run_debate(
-                        report=report,
-                        simulation=st.session_state.simulation_results,
-                        params=st.session_state.params,  # Use params from session state
-                        max_rounds=10
-                    )
-                
-                st.success(f"✅ Debate completed in {st.session_state.debate_result.total_rounds} rounds!")
-            
-            except Exception as e:
-                st.error(f"❌ Error during debate: {str(e)}")
-                st.exception(e)
-    
-        # Display debate if it exists
-        if st.session_state.debate_result is not None:
-            debate = st.session_state.debate_result
-        
-            # Convergence status
-            if debate.converged:
-                st.markdown(f"""
-                <div class="status-badge success" style="margin-bottom: 1rem;">
-                    <span>✅ CONVERGED (Round {debate.convergence_round})</span>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="status-badge warning" style="margin-bottom: 1rem;">
-                    <span>⚠️ NO FULL CONVERGENCE ({debate.total_rounds} rounds)</span>
-                </div>
-                """, unsafe_allow_html=True)
-        
-            # Debate transcript
-            with st.expander("📜 View Full Debate Transcript", expanded=True):
-                for turn in debate.debate_log:
-                    # Determine color based on speaker
-                    if turn.speaker == "OpenAI":
-                        bg_color = "rgba(16, 185, 129, 0.1)"  # Green tint
-                        border_color = "#10B981"
-                        icon = "🟢"
-                    else:
-                        bg_color = "rgba(239, 68, 68, 0.1)"  # Red tint
-                        border_color = "#EF4444"
-                        icon = "🔴"
-                
-                    st.markdown(f"""
-                    <div style="
-                        background: {bg_color};
-                        border-left: 3px solid {border_color};
-                        border-radius: 0.5rem;
-                        padding: 1rem;
-                        margin-bottom: 0.75rem;
-                    ">
-                        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                            <strong style="font-size: 0.875rem; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">{icon} {turn.speaker} ({turn.role})</strong>
-                            <span style="font-size: 0.75rem; color: var(--muted-foreground); font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">Round {turn.round_number}</span>
-                        </div>
-                        <p style="margin: 0; font-size: 0.875rem; line-height: 1.6; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; white-space: pre-wrap;">{turn.message.replace('$', '\$')}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-            # Consensus summary
-            st.markdown("### 🎯 Consensus Summary")
-            st.markdown(debate.consensus_summary.replace('$', '\$'))
-        
-            # Final verdict
-            st.markdown(f"""
-            <div class="metric-card" style="text-align: center; margin-top: 1rem;">
-                <p class="metric-label">FINAL INVESTMENT VERDICT</p>
-                <p class="metric-value" style="font-size: 2rem;">{debate.final_verdict}</p>
-                <p class="metric-subtitle">Confidence: {debate.confidence_level}</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-        # 4. Final Report
-        st.markdown("## 📄 Report Generation")
-        if st.button("📥 Generate PDF Report", type="primary"):
-            try:
-                with st.spinner("Generating PDF report..."):
-                    output_path = "final_report.pdf"
-                    # Include debate result if available
-                    debate_data = st.session_state.get('debate_result', None)
-                    evaluator.generate_pdf(simulation_results, critic_verdict, report, output_path, debate_data)
-            
-                st.success("✅ PDF report generated successfully!")
-            
-                with open(output_path, "rb") as f:
-                    st.download_button(
-                        label="⬇️ Download PDF",
-                        data=f,
-                        file_name="counterfactual_report.pdf",
-                        mime="application/pdf",
-                        use_container_width=True
-                    )
-            except Exception as e:
-                st.error(f"❌ Error generating PDF: {str(e)}")
-                st.exception(e)
+        render_debate(report, report_json, simulation_results, critic_verdict)
 else:
     # Welcome Screen
-    st.markdown("""
-    <div style="text-align: center; padding: 4rem 2rem;">
-        <div style="font-size: 4rem; margin-bottom: 1rem;">🔮</div>
-        <h2 style="margin-bottom: 0.5rem;">Welcome to Counterfactual Financial Oracle</h2>
-        <p style="color: var(--muted-foreground); margin-bottom: 2rem;">Upload a financial report to begin your analysis</p>
-        <div style="max-width: 600px; margin: 0 auto; text-align: left;">
-            <h3 style="font-size: 1rem; margin-bottom: 1rem;">Features:</h3>
-            <ul style="color: var(--muted-foreground); line-height: 1.8;">
-                <li>🤖 AI-powered document extraction with Landing AI</li>
-                <li>📈 Monte Carlo simulation (10,000 scenarios)</li>
-                <li>🛡️ Adversarial critique with DeepSeek</li>
-                <li>📊 DCF valuation with Gordon Growth model</li>
-                <li>📄 Professional PDF report generation</li>
-            </ul>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(WELCOME_HTML, unsafe_allow_html=True)
 
 # Footer
-st.markdown("""
-<div class="footer">
-    <div style="display: flex; justify-content: space-between; align-items: center;">
-        <div style="display: flex; gap: 1.5rem;">
-            <span>Last updated: 2024-11-19 14:34:22 UTC</span>
-            <span>•</span>
-            <span>Compute time: 2.847s</span>
-            <span>•</span>
-            <span style="display: flex; align-items: center; gap: 0.375rem;">
-                <span style="width: 6px; height: 6px; border-radius: 50%; background: var(--success);"></span>
-                All systems operational
-            </span>
-        </div>
-    </div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
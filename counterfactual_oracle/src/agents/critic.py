@@ -1,9 +1,29 @@
 from openai import OpenAI
+import asyncio
 import json
 import os
 from ..models import FinancialReport, AggregatedSimulation, CriticVerdict
 from ..logic import check_balance_sheet
 
+# Static rubric sent as the system message so it forms a stable, cacheable prefix
+SYSTEM_PROMPT = """
+You are a strict financial critic and a senior financial report analyst. Output JSON only.
+
+Tasks:
+1. **Verify Consistency**: Ensure the simulation results (e.g., Revenue Growth) match the input parameters. Call out any contradictions.
+2. **Fact-Check Claims**: If the analysis mentions specific drivers (e.g., "cost cutting"), verify if the OpEx numbers actually decreased. If not, flag it as an unsupported assumption.
+3. **Demand Evidence**: If the analysis is vague (e.g., "operational efficiency"), demand to know WHICH line item improved (SG&A? R&D?) and by how much.
+4. **Compare against industry norms**: Assume standard tech margins if not specified.
+
+Return JSON:
+{
+    "verdict": "approve" or "revise",
+    "comparative_analysis": ["point 1", "point 2"],
+    "unsupported_assumptions": ["assumption 1", "assumption 2"],
+    "correction_instructions": "instructions if revise"
+}
+"""
+
 class CriticAgent:
     def __init__(self, api_key: str):
         # DeepSeek API uses a different authentication format
@@ -17,38 +37,44 @@ class CriticAgent:
         """
         Critiques the simulation results.
         """
+        return asyncio.run(self.acritique(report, simulation))
+
+    async def aprecheck(self, report: FinancialReport) -> dict:
+        """
+        Report-only pre-work for the critique (deterministic checks + report serialization).
+        Does not depend on the simulation, so it can run while the simulator is still busy.
+        """
+        def _scan():
+            return {
+                "balance_sheet_check": check_balance_sheet(report.balance_sheet),
+                "report_json": report.model_dump_json()
+            }
+        return await asyncio.to_thread(_scan)
+
+    async def acritique(self, report: FinancialReport, simulation: AggregatedSimulation, precheck: dict = None) -> CriticVerdict:
+        """
+        Async variant of critique. Pass the result of aprecheck() to skip redoing it.
+        """
+        if precheck is None:
+            precheck = await self.aprecheck(report)
         
         # 1. Run Deterministic Checks
-        bs_check = check_balance_sheet(report.balance_sheet)
+        bs_check = precheck["balance_sheet_check"]
         
         # 2. Run LLM Critique
+        # Report data and checks first, simulation last: only the tail changes between scenario runs
         prompt = f"""
-        You are a senior financial report analyst and a strict critic.
-        
-        Report Data: {report.model_dump_json()}
-        Simulation Results: {simulation.model_dump_json(exclude={'simulation_runs'})}
+        Report Data: {precheck["report_json"]}
         Balance Sheet Check: {bs_check}
-        
-        Tasks:
-        1. **Verify Consistency**: Ensure the simulation results (e.g., Revenue Growth) match the input parameters. Call out any contradictions.
-        2. **Fact-Check Claims**: If the analysis mentions specific drivers (e.g., "cost cutting"), verify if the OpEx numbers actually decreased. If not, flag it as an unsupported assumption.
-        3. **Demand Evidence**: If the analysis is vague (e.g., "operational efficiency"), demand to know WHICH line item improved (SG&A? R&D?) and by how much.
-        4. **Compare against industry norms**: Assume standard tech margins if not specified.
-        
-        Return JSON:
-        {{
-            "verdict": "approve" or "revise",
-            "comparative_analysis": ["point 1", "point 2"],
-            "unsupported_assumptions": ["assumption 1", "assumption 2"],
-            "correction_instructions": "instructions if revise"
-        }}
+        Simulation Results: {simulation.model_dump_json(exclude={'simulation_runs'})}
         """
         
         try:
-            response = self.client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are a strict financial critic. Output JSON only."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 response_format={"type": "json_object"}
@@ -8,6 +8,13 @@ class EvaluatorAgent:
 
     def generate_pdf(self, simulation: AggregatedSimulation, critic: CriticVerdict, 
                      report: FinancialReport, output_path: str, debate_result: Optional[DebateResult] = None):
+        with open(output_path, "wb") as f:
+            f.write(self.render_pdf(simulation, critic, report, debate_result))
+        return output_path
+
+    def render_pdf(self, simulation: AggregatedSimulation, critic: CriticVerdict,
+                   report: FinancialReport, debate_result: Optional[DebateResult] = None) -> bytes:
+        """Build the report entirely in memory and return the PDF bytes"""
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", size=12)
@@ -56,9 +63,14 @@ class EvaluatorAgent:
             pdf.cell(200, 10, txt="AI Analyst Debate Transcript", ln=1, align='C')
             pdf.ln(5)
             
+            if debate_result.converged:
+                outcome = "Consensus was reached."
+            elif debate_result.stop_reason == "one_sided":
+                outcome = "One view dominated, so the debate was stopped early."
+            else:
+                outcome = "Healthy disagreement remained."
             pdf.set_font("Arial", 'I', 10)
-            pdf.multi_cell(0, 5, txt=f"Two AI analysts debated the financial analysis for {debate_result.total_rounds} rounds. "
-                                     f"{'Consensus was reached.' if debate_result.converged else 'Healthy disagreement remained.'}")
+            pdf.multi_cell(0, 5, txt=f"Two AI analysts debated the financial analysis for {debate_result.total_rounds} rounds. {outcome}")
             pdf.ln(3)
             
             # Convergence status
@@ -66,6 +78,8 @@ class EvaluatorAgent:
             status_text = f"Status: {'CONVERGED' if debate_result.converged else 'DIVERGED'}"
             if debate_result.converged:
                 status_text += f" (Round {debate_result.convergence_round})"
+            elif debate_result.stop_reason == "one_sided":
+                status_text = "Status: STOPPED EARLY (one-sided debate)"
             pdf.cell(200, 8, txt=status_text, ln=1)
             pdf.ln(3)
             
@@ -168,6 +182,5 @@ class EvaluatorAgent:
         pdf.multi_cell(0, 4, txt="Note: All values extracted using Landing AI Advanced Document Extraction (ADE). "
                                   "Source references indicate the document section or calculation method.")
         
-        pdf.output(output_path)
-        return output_path
+        return pdf.output(dest='S').encode('latin-1')
 
@@ -18,20 +18,27 @@ class LandingAIClient:
         """
         Extracts data from a PDF using Landing AI ADE API.
         """
+        with open(pdf_path, 'rb') as f:
+            data = f.read()
+        return self.extract_data_from_bytes(data, filename=os.path.basename(pdf_path))
+
+    def extract_data_from_bytes(self, data: bytes, filename: str = "upload.pdf") -> FinancialReport:
+        """
+        Extracts data from in-memory PDF bytes using Landing AI ADE API (no temp file needed).
+        """
         headers = {
             "Authorization": f"Bearer {self.api_key}",
         }
         
         # Upload the PDF and request extraction
         # Increase timeout to 15 minutes for large financial PDFs
-        with open(pdf_path, 'rb') as f:
-            files = {'document': f}
-            response = requests.post(
-                f"{self.base_url}/parse",
-                headers=headers,
-                files=files,
-                timeout=900  # 15 minutes timeout for large PDFs
-            )
+        files = {'document': (filename, data, 'application/pdf')}
+        response = requests.post(
+            f"{self.base_url}/parse",
+            headers=headers,
+            files=files,
+            timeout=900  # 15 minutes timeout for large PDFs
+        )
         
         # Only accept 200 OK. 206 (Partial Content) means corrupted data
         if response.status_code != 200:
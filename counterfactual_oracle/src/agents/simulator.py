@@ -1,13 +1,36 @@
 import google.generativeai as genai
+import asyncio
 import json
 import os
 from ..models import FinancialReport, ScenarioParams, AggregatedSimulation
 from ..logic import run_monte_carlo
 
+# Static instructions live in the system instruction so every request shares
+# the same prefix and the provider can serve it from its prompt cache.
+SYSTEM_PROMPT = """
+You are a professional financial analyst.
+
+You will be given a report context, the parameters of a Monte Carlo simulation and its results.
+
+**CRITICAL INSTRUCTIONS:**
+1. **STRICT GROUNDING**: You must ONLY use drivers present in the provided Report Context or Simulation Results. Do NOT invent "new product launches", "marketing efficiency", or "customer retention programs" unless they are explicitly in the data.
+2. **CITE NUMBERS**: You must cite specific numbers from the report to support your arguments (e.g., "Given R&D of $7.7B...", "With OpEx at 12% of revenue...").
+3. **CONSISTENCY**: If the simulation shows 0% growth, do NOT argue for growth. Explain the result based on the inputs (e.g., "Revenue remained flat due to the 0 bps growth assumption").
+
+For 'assumption_log', describe the transformations based on the actual simulation parameters.
+For 'traceability', explain where the base numbers came from (refer to the report structure).
+
+Return ONLY valid JSON in this format:
+{
+    "assumption_log": ["log entry 1", "log entry 2"],
+    "traceability": {"Metric": "Source"}
+}
+"""
+
 class SimulatorAgent:
     def __init__(self, api_key: str):
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        self.model = genai.GenerativeModel('gemini-2.0-flash-exp', system_instruction=SYSTEM_PROMPT)
 
     def run_simulation(self, report: FinancialReport, params: ScenarioParams) -> AggregatedSimulation:
         """
@@ -15,48 +38,23 @@ class SimulatorAgent:
         1. Uses Python logic for Monte Carlo (more reliable for math than LLM).
         2. Uses LLM to generate the qualitative "Assumption Log" and "Traceability" based on the results.
         """
+        return asyncio.run(self.arun_simulation(report, params))
+
+    async def arun_simulation(self, report: FinancialReport, params: ScenarioParams) -> AggregatedSimulation:
+        """
+        Async variant of run_simulation.
+        The Monte Carlo run and the Gemini call are pushed off the event loop so the
+        caller can overlap other agents' work with them.
+        """
         
         # 1. Run Math
-        agg_results = run_monte_carlo(report, params)
+        agg_results = await asyncio.to_thread(run_monte_carlo, report, params)
         
         # 2. Generate Qualitative Analysis via LLM
-        prompt = f"""
-        You are a professional financial analyst.
-        
-        I have run a Monte Carlo simulation with the following parameters:
-        - OpEx Delta: {params.opex_delta_bps} bps
-        - Revenue Growth Delta: {params.revenue_growth_bps} bps
-        - Discount Rate Delta: {params.discount_rate_bps} bps
-        
-        The results are:
-        - Median NPV: ${agg_results.median_npv:,.2f}
-        - Median Revenue: ${agg_results.median_revenue:,.2f}
-        - Median EBITDA: ${agg_results.median_ebitda:,.2f}
-        
-        Report Context:
-        - Revenue: ${report.income_statement.Revenue:,.2f}
-        - OpEx: ${report.income_statement.OpEx:,.2f}
-        - Net Income: ${report.income_statement.NetIncome:,.2f}
-        
-        Please generate a structured 'assumption_log' and 'traceability' explanation.
-        
-        **CRITICAL INSTRUCTIONS:**
-        1. **STRICT GROUNDING**: You must ONLY use drivers present in the provided Report Context or Simulation Results. Do NOT invent "new product launches", "marketing efficiency", or "customer retention programs" unless they are explicitly in the data.
-        2. **CITE NUMBERS**: You must cite specific numbers from the report to support your arguments (e.g., "Given R&D of $7.7B...", "With OpEx at 12% of revenue...").
-        3. **CONSISTENCY**: If the simulation shows 0% growth, do NOT argue for growth. Explain the result based on the inputs (e.g., "Revenue remained flat due to the 0 bps growth assumption").
-        
-        For 'assumption_log', describe the transformations based on the actual simulation parameters.
-        For 'traceability', explain where the base numbers came from (refer to the report structure).
-        
-        Return ONLY valid JSON in this format:
-        {{
-            "assumption_log": ["log entry 1", "log entry 2"],
-            "traceability": {{"Metric": "Source"}}
-        }}
-        """
+        prompt = self._build_prompt(report, params, agg_results)
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
             content = response.text
             
             # Clean up markdown code blocks if present
@@ -76,3 +74,23 @@ class SimulatorAgent:
             
         return agg_results
 
+    def _build_prompt(self, report: FinancialReport, params: ScenarioParams, agg_results: AggregatedSimulation) -> str:
+        # Report context first: it is identical across scenario runs on the same report
+        return f"""
+        Report Context:
+        - Revenue: ${report.income_statement.Revenue:,.2f}
+        - OpEx: ${report.income_statement.OpEx:,.2f}
+        - Net Income: ${report.income_statement.NetIncome:,.2f}
+        
+        I have run a Monte Carlo simulation with the following parameters:
+        - OpEx Delta: {params.opex_delta_bps} bps
+        - Revenue Growth Delta: {params.revenue_growth_bps} bps
+        - Discount Rate Delta: {params.discount_rate_bps} bps
+        
+        The results are:
+        - Median NPV: ${agg_results.median_npv:,.2f}
+        - Median Revenue: ${agg_results.median_revenue:,.2f}
+        - Median EBITDA: ${agg_results.median_ebitda:,.2f}
+        
+        Please generate a structured 'assumption_log' and 'traceability' explanation.
+        """
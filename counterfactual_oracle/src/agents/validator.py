@@ -1,14 +1,80 @@
-from openai import OpenAI
-import time
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, RateLimitError, InternalServerError
+import asyncio
 import json
-from typing import Dict, Any, List, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, Collection, List, Optional
 from ..models import FinancialReport, AggregatedSimulation
+from ..rate_limiter import RateLimiter, estimate_tokens
+
+# A dollar figure with its sign on either side ("-$508,647" or "$-508,647"); a hyphen
+# straight after a word ("$1-$2") is a range, not a sign
+_DOLLAR_FIGURE = re.compile(r'(?:(?<![\w.])-)?\$-?\d[\d,]*(?:\.\d+)?')
+# Any cited number, with or without a $ sign; "Year 5" / "Round 4" references aren't figures
+_NUMBER = re.compile(r'(?<![\w.])(?<!year )(?<!round )\$?\d[\d,]*(?:\.\d+)?', re.IGNORECASE)
+# Figures a lookup can't confirm (percentages, multiples, bps, scaled amounts like $1.2M);
+# statements containing any of these still go to the LLM validator
+_DERIVED_FIGURE = re.compile(
+    r'\d\s*(?:%|x\b|bps\b)|\$\d[\d,]*(?:\.\d+)?\s*(?:[kmbt]n?\b|thousand|million|billion|trillion)',
+    re.IGNORECASE
+)
+
+# Relative slack when matching a self-reported figure against the data
+CLAIM_TOLERANCE = 0.01
+
+
+def _signed(figure: str) -> str:
+    """One spelling per dollar figure: the minus sign, if any, before the $."""
+    return "-" + figure.replace("-", "") if "-" in figure else figure
+
+
+@lru_cache(maxsize=64)
+def _validator_instructions(revenue, opex, ebitda, net_income, median_npv, median_revenue, median_ebitda) -> str:
+    """
+    Everything in the validation request except the statement itself. Sent as
+    the system message, so every validation of a scenario shares one
+    byte-identical prefix the provider can cache.
+    """
+    return f"""
+        You are a strict Realism Validator for a financial debate.
+        
+        Your Job: Check if the Analyst's statement (in the user message) contains hallucinations, math errors, or blocked concepts.
+        
+        CONTEXT (The ONLY truth):
+        - Revenue: ${revenue:,.0f}
+        - OpEx: ${opex:,.0f}
+        - EBITDA: ${ebitda:,.0f}
+        - Net Income: ${net_income:,.0f}
+        
+        SIMULATION RESULTS (The ONLY future truth):
+        - Median NPV: ${median_npv:,.0f}
+        - Median Revenue: ${median_revenue:,.0f}
+        - Median EBITDA: ${median_ebitda:,.0f}
+        
+        VALIDATION RULES:
+        1. **No Hallucinations**: Reject claims about "new products", "pre-orders", "market expansion", or "internal data" not in Context.
+        2. **Math Consistency**: Reject claims like "EBITDA is strong" if it dropped in the simulation. Reject "margin expansion" if OpEx delta is positive (costs rising).
+        3. **Strict Grounding**: Every number cited must exist in the Context or be a direct calculation from it.
+        
+        Return JSON ONLY:
+        {{
+            "is_valid": boolean,
+            "issues": ["list of specific errors"],
+            "feedback": "Instructions to the analyst to fix the statement (e.g., 'Remove reference to new product, cite actual OpEx of $14B')"
+        }}
+        """
 
 class RealismValidatorAgent:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(
-            api_key=api_key
-        )
+    def __init__(
+        self,
+        api_key: str,
+        limiter: Optional[RateLimiter] = None,
+        http_client: Optional[DefaultAsyncHttpxClient] = None
+    ):
+        self.api_key = api_key
+        self.connect(http_client)
+        # Pass the caller's OpenAI limiter to share one request budget
+        self.limiter = limiter or RateLimiter.for_provider("openai")
         
         self.blocklist = [
             "new product", "product launch", "market expansion", 
@@ -17,6 +83,13 @@ class RealismValidatorAgent:
             "marketing efficiency", "unspecified cost savings"
         ]
 
+    def connect(self, http_client: Optional[DefaultAsyncHttpxClient] = None):
+        """(Re)build the API client; pass the caller's http_client to reuse its connection pool"""
+        self.client = AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=http_client
+        )
+
     def validate_statement(
         self, 
         statement: str, 
@@ -27,59 +100,167 @@ class RealismValidatorAgent:
         Validates a debate statement for realism, grounding, and math consistency.
         Returns a dict with 'is_valid' (bool), 'issues' (list), and 'corrected_text' (str).
         """
-        
-        # 1. Quick Keyword Check (Fast Fail)
-        found_blocked = [term for term in self.blocklist if term in statement.lower()]
+        async def run():
+            # A client (and pool) bound to this call's event loop, closed before asyncio.run returns
+            async with AsyncOpenAI(api_key=self.api_key) as client:
+                return await self.avalidate_statement(statement, report, simulation, client=client)
+        return asyncio.run(run())
+
+    def quick_check(
+        self, 
+        statement: str, 
+        report: Optional[FinancialReport] = None, 
+        simulation: Optional[AggregatedSimulation] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cheap blocklist check with no LLM call, safe to run on partial (streamed) text.
+        Returns a rejection in the same shape as avalidate_statement, or None if nothing is wrong yet.
+        """
+        lowered = statement.lower()
+        found_blocked = [term for term in self.blocklist if term in lowered]
         if found_blocked:
             return {
                 "is_valid": False,
                 "issues": [f"Used blocked term: '{term}'" for term in found_blocked],
                 "feedback": f"You mentioned {found_blocked}. This data does not exist in the report. Remove it and stick to the provided numbers."
             }
+        return None
 
-        # 2. LLM Validation
-        prompt = f"""
-        You are a strict Realism Validator for a financial debate.
-        
-        Your Job: Check if the Analyst's statement contains hallucinations, math errors, or blocked concepts.
-        
-        CONTEXT (The ONLY truth):
-        - Revenue: ${report.income_statement.Revenue:,.0f}
-        - OpEx: ${report.income_statement.OpEx:,.0f}
-        - EBITDA: ${report.income_statement.EBITDA:,.0f}
-        - Net Income: ${report.income_statement.NetIncome:,.0f}
-        
-        SIMULATION RESULTS (The ONLY future truth):
-        - Median NPV: ${simulation.median_npv:,.0f}
-        - Median Revenue: ${simulation.median_revenue:,.0f}
-        - Median EBITDA: ${simulation.median_ebitda:,.0f}
-        
-        ANALYST STATEMENT:
-        "{statement}"
-        
-        VALIDATION RULES:
-        1. **No Hallucinations**: Reject claims about "new products", "pre-orders", "market expansion", or "internal data" not in Context.
-        2. **Math Consistency**: Reject claims like "EBITDA is strong" if it dropped in the simulation. Reject "margin expansion" if OpEx delta is positive (costs rising).
-        3. **Strict Grounding**: Every number cited must exist in the Context or be a direct calculation from it.
-        
-        Return JSON ONLY:
-        {{
-            "is_valid": boolean,
-            "issues": ["list of specific errors"],
-            "feedback": "Instructions to the analyst to fix the statement (e.g., 'Remove reference to new product, cite actual OpEx of $14B')"
-        }}
+    def grounding_check(
+        self, 
+        statement: str, 
+        grounded_figures: Collection[str], 
+        partial: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Rejects dollar figures that are not verbatim among grounded_figures (no LLM call).
+        A minus sign may sit on either side of the $ in both.
+        With partial=True a figure running into the end of the text is skipped, as streaming may have cut it off.
+        """
+        grounded = {_signed(figure) for figure in grounded_figures}
+        ungrounded = []
+        for m in _DOLLAR_FIGURE.finditer(statement):
+            if partial and m.end() == len(statement):
+                continue
+            figure = m.group().rstrip(',')
+            if _signed(figure) not in grounded and figure not in ungrounded:
+                ungrounded.append(figure)
+        if ungrounded:
+            return {
+                "is_valid": False,
+                "issues": [f"Cited figure not in the data: {figure}" for figure in ungrounded],
+                "feedback": f"You cited {ungrounded}, which do not appear in the grounded figures. Quote the provided dollar amounts exactly as written."
+            }
+        return None
+
+    def local_check(
+        self, 
+        statement: str, 
+        report: FinancialReport, 
+        simulation: AggregatedSimulation
+    ) -> bool:
         """
+        True if the statement cites at least one figure and every number in it
+        (with or without a $) matches a reported or simulated figure within
+        CLAIM_TOLERANCE, with nothing derived claimed; it then needs no LLM
+        pass. False means it needs judgment, including when it cites nothing.
+        """
+        if _DERIVED_FIGURE.search(statement):
+            return False
+        known = [f for f in (
+            report.income_statement.Revenue, report.income_statement.OpEx,
+            report.income_statement.EBITDA, report.income_statement.NetIncome,
+            report.cash_flow.FreeCashFlow, report.balance_sheet.Cash,
+            simulation.median_npv, simulation.median_revenue, simulation.median_ebitda,
+            *simulation.revenue_forecast_p50, *simulation.ebitda_forecast_p50, *simulation.fcf_forecast_p50
+        ) if f is not None]
+        grounded = False
+        for m in _NUMBER.finditer(statement):
+            cited = float(m.group().lstrip('$').rstrip(',').replace(',', ''))
+            if not any(abs(cited - f) <= CLAIM_TOLERANCE * abs(f) for f in known):
+                return False
+            grounded = True
+        return grounded
+
+    def check_claims(
+        self, 
+        claims: Dict[str, Any], 
+        report: FinancialReport, 
+        simulation: AggregatedSimulation
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Arithmetic check of an analyst's self-reported figures (no LLM call).
+        claimed_revenue / claimed_ebitda must match a reported or simulated
+        figure within CLAIM_TOLERANCE, and formula_used must be stated.
+        Returns a rejection, or None if the claims hold.
+        """
+        known = {
+            "claimed_revenue": [report.income_statement.Revenue, simulation.median_revenue, *simulation.revenue_forecast_p50],
+            "claimed_ebitda": [report.income_statement.EBITDA, simulation.median_ebitda, *simulation.ebitda_forecast_p50],
+        }
+        issues = []
+        for field, figures in known.items():
+            try:
+                claimed = float(claims[field])
+            except (KeyError, TypeError, ValueError):
+                issues.append(f"Missing or non-numeric {field}")
+                continue
+            if not any(abs(claimed - f) <= CLAIM_TOLERANCE * abs(f) for f in figures):
+                issues.append(f"{field} {claimed:,.0f} does not match the data")
+        if not str(claims.get("formula_used") or "").strip():
+            issues.append("Missing formula_used")
+        if issues:
+            return {
+                "is_valid": False,
+                "issues": issues,
+                "feedback": "Base the argument on the reported and simulated Revenue/EBITDA figures and state how you used them."
+            }
+        return None
+
+    async def avalidate_statement(
+        self, 
+        statement: str, 
+        report: FinancialReport, 
+        simulation: AggregatedSimulation,
+        client: Optional[AsyncOpenAI] = None
+    ) -> Dict[str, Any]:
+        """Async variant of validate_statement (client defaults to this validator's own)"""
+        client = client or self.client
         
+        # 1. Quick Keyword Check (Fast Fail)
+        rejection = self.quick_check(statement, report, simulation)
+        if rejection is not None:
+            return rejection
 
+        # 2. Local fast path: only data figures cited, nothing for the LLM to judge
+        if self.local_check(statement, report, simulation):
+            return {"is_valid": True, "issues": [], "feedback": ""}
+
+        # 3. LLM Validation
+        instructions = _validator_instructions(
+            report.income_statement.Revenue,
+            report.income_statement.OpEx,
+            report.income_statement.EBITDA,
+            report.income_statement.NetIncome,
+            simulation.median_npv,
+            simulation.median_revenue,
+            simulation.median_ebitda
+        )
+        messages = [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": f'ANALYST STATEMENT:\n"{statement}"'}
+        ]
         
         try:
-            # RATE LIMITING: Standard pause
-            time.sleep(1)
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1
+            response = await self.limiter.call(
+                lambda: client.chat.completions.create(
+                    model="gpt-4-turbo",
+                    messages=messages,
+                    temperature=0.1
+                ),
+                est_tokens=estimate_tokens(instructions) + estimate_tokens(statement),
+                retry_on=(InternalServerError,),
+                throttle_on=(RateLimitError,)
             )
             text = response.choices[0].message.content
             if '```json' in text:
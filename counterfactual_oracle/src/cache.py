@@ -0,0 +1,77 @@
+"""
+Disk cache for LLM outputs (critic verdicts, debates) that are expensive to regenerate.
+
+Entries are JSON strings stored one file per key, so they survive Streamlit
+restarts and are shared between sessions on the same machine.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+from .models import ScenarioParams
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "oracle_cache")
+
+# Scenario sliders are snapped to this grid before keying, so a 3 bp nudge reuses the prior answer
+BPS_BUCKET = 10
+
+
+def make_key(*parts) -> str:
+    """Stable hex key for any JSON-serializable parts"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def quantize_params(params: ScenarioParams, bucket: int = BPS_BUCKET) -> tuple:
+    """Snap scenario deltas to the nearest bucket (e.g. -3 and +4 bps both land on 0)"""
+    return (
+        round(params.opex_delta_bps / bucket),
+        round(params.revenue_growth_bps / bucket),
+        round(params.discount_rate_bps / bucket),
+        round(params.tax_rate_delta_bps / bucket),
+    )
+
+
+class DiskCache:
+    def __init__(self, namespace: str, directory: Optional[str] = None, ttl: float = 7 * 24 * 3600, shard: bool = False):
+        # ORACLE_CACHE_DIR is read per cache rather than at import, so it can be redirected (e.g. by tests)
+        self.path = os.path.join(directory or os.getenv("ORACLE_CACHE_DIR", DEFAULT_CACHE_DIR), namespace)
+        self.ttl = ttl
+        # Sharded caches spread files over subdirectories by key prefix ({key[:2]}/{key}.json)
+        # so large namespaces don't pile thousands of files into one directory
+        self.shard = shard
+        os.makedirs(self.path, exist_ok=True)
+
+    def _dir(self, key: str) -> str:
+        return os.path.join(self.path, key[:2]) if self.shard else self.path
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self._dir(key), f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached value, or None if missing or older than ttl"""
+        path = self._file(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Write atomically so a concurrent reader never sees a partial file"""
+        directory = self._dir(key)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp, self._file(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
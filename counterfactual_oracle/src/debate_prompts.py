@@ -5,8 +5,31 @@ Defines structured prompts for multi-round financial analysis debates
 between Gemini (Optimist) and DeepSeek (Skeptic).
 """
 
-# Persona Definitions
-GEMINI_PERSONA = """You are the OPTIMIST FINANCIAL ANALYST (ADVANCED VERSION).
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Tuple
+
+_TRAILING_SPACE = re.compile(r'[ \t]+\n')
+
+def _canonicalize(prompt):
+    """
+    Normalize newlines and strip trailing whitespace so equal inputs always give
+    byte-identical prompts (provider prefix caches match on exact bytes)
+    """
+    prompt = prompt.replace('\r\n', '\n').replace('\r', '\n')
+    return _TRAILING_SPACE.sub('\n', prompt).rstrip() + '\n'
+
+def _canonical(builder):
+    """Decorator: pass a prompt builder's output through _canonicalize"""
+    @wraps(builder)
+    def wrapper(*args, **kwargs):
+        return _canonicalize(builder(*args, **kwargs))
+    return wrapper
+
+# Persona Definitions (interned: every system prompt and cache key shares the one object)
+GEMINI_PERSONA = sys.intern("""You are the OPTIMIST FINANCIAL ANALYST (ADVANCED VERSION).
 Your purpose is not to be blindly bullish. Your purpose is to present the most analytically rigorous optimistic interpretation of the company’s financial statements and scenario results.
 
 🎯 CORE OBJECTIVES
@@ -88,9 +111,9 @@ RULE 8: DEFINE ALLOWED vs. FORBIDDEN COMMENTS
   - Multi-year projections beyond what's provided
   - Risk repricing without justification
 
-Keep responses concise (2-3 paragraphs max) and professional."""
+Keep responses concise (2-3 paragraphs max) and professional.""")
 
-DEEPSEEK_PERSONA = """You are a SKEPTICAL financial analyst. Your role is to:
+DEEPSEEK_PERSONA = sys.intern("""You are a SKEPTICAL financial analyst. Your role is to:
 - Analyze the CONSEQUENCES of the scenario
 - Question whether the OUTCOMES (margins, cash flow) make sense GIVEN the inputs
 - Point out potential downside scenarios or second-order effects
@@ -145,47 +168,95 @@ RULE 8: DEFINE ALLOWED vs. FORBIDDEN COMMENTS
   - Multi-year projections beyond what's provided
   - Risk repricing without justification
 
-Keep responses concise (2-3 paragraphs max) and professional."""
+Keep responses concise (2-3 paragraphs max) and professional.""")
 
 # Round-Specific Prompts
-def get_gemini_opening_prompt(report, simulation, params):
-    """Generate opening statement for Gemini (Optimist)"""
+#
+# Every turn is sent as two messages: a system message (persona + scenario data)
+# that is byte-identical for the whole debate, so provider prefix caching can
+# reuse it, and a short user message carrying only what changes per turn.
+
+@dataclass(frozen=True, slots=True)
+class PromptNumerics:
+    """
+    The scenario figures the prompts quote, read off the report and simulation
+    models in one go. Hashable, so it keys the memoized renderers below and
+    each scenario's figures are formatted only once.
+    """
+    revenue: float
+    opex: float
+    ebitda: float
+    historical_fcf: float
+    cash: float
+    median_npv: float
+    revenue_p50: Tuple[float, ...]
+    ebitda_p50: Tuple[float, ...]
+    fcf_p50: Tuple[float, ...]
+
+    @classmethod
+    def from_models(cls, report, simulation):
+        return cls(
+            report.income_statement.Revenue,
+            report.income_statement.OpEx,
+            report.income_statement.EBITDA,
+            report.cash_flow.FreeCashFlow,
+            report.balance_sheet.Cash,
+            simulation.median_npv,
+            tuple(simulation.revenue_forecast_p50),
+            tuple(simulation.ebitda_forecast_p50),
+            tuple(simulation.fcf_forecast_p50),
+        )
+
+def get_debate_context(report, simulation, params):
+    """Scenario data shared by every turn of a debate (deterministic, no per-turn content)"""
+    return _render_debate_context(
+        PromptNumerics.from_models(report, simulation),
+        params.opex_delta_bps,
+        params.revenue_growth_bps,
+        params.discount_rate_bps,
+    )
+
+@lru_cache(maxsize=64)
+@_canonical
+def _render_debate_context(numerics, opex_delta_bps, revenue_growth_bps, discount_rate_bps):
+    # Keyed on only the numbers the context shows, so every turn of a debate
+    # (and repeat debates on the same scenario) reuse one rendered string
+    revenue, opex, ebitda = numerics.revenue, numerics.opex, numerics.ebitda
+    historical_fcf, cash, median_npv = numerics.historical_fcf, numerics.cash, numerics.median_npv
+    revenue_p50, ebitda_p50, fcf_p50 = numerics.revenue_p50, numerics.ebitda_p50, numerics.fcf_p50
     
     # Format forecast data for prompt
     forecast_str = ""
     years = range(1, 6)
-    for t, rev, ebitda, fcf in zip(years, simulation.revenue_forecast_p50, simulation.ebitda_forecast_p50, simulation.fcf_forecast_p50):
-        forecast_str += f"Year {t}: Rev ${rev:,.0f} | EBITDA ${ebitda:,.0f} | FCF ${fcf:,.0f}\n"
+    for t, rev, ebitda_t, fcf in zip(years, revenue_p50, ebitda_p50, fcf_p50):
+        forecast_str += f"Year {t}: Rev ${rev:,.0f} | EBITDA ${ebitda_t:,.0f} | FCF ${fcf:,.0f}\n"
     
     # Add dedicated FCF section
-    historical_fcf = report.cash_flow.FreeCashFlow
     fcf_section = "\n📊 FREE CASH FLOW TRAJECTORY (Year-by-Year):\n"
     fcf_section += f"Historical FCF (Baseline): ${historical_fcf:,.0f}\n\n"
     fcf_section += "Simulated FCF Path:\n"
-    for t, fcf in enumerate(simulation.fcf_forecast_p50, start=1):
+    for t, fcf in enumerate(fcf_p50, start=1):
         change_vs_historical = ((fcf - historical_fcf) / historical_fcf * 100) if historical_fcf > 0 else 0
         fcf_section += f"  • Year {t}: ${fcf:,.0f} ({change_vs_historical:+.1f}% vs historical)\n"
 
     return f"""
-{GEMINI_PERSONA}
-
 You are analyzing a CAUSAL COUNTERFACTUAL SIMULATION - a parallel universe scenario based on real financial data.
 
 HISTORICAL REALITY (from PDF):
-- Current Revenue: ${report.income_statement.Revenue:,.0f}
-- Current OpEx: ${report.income_statement.OpEx:,.0f}
-- Current EBITDA: ${report.income_statement.EBITDA:,.0f}
+- Current Revenue: ${revenue:,.0f}
+- Current OpEx: ${opex:,.0f}
+- Current EBITDA: ${ebitda:,.0f}
 - Current Free Cash Flow: ${historical_fcf:,.0f}
-- Current Cash Balance: ${report.balance_sheet.Cash:,.0f} (Liquidity Buffer)
+- Current Cash Balance: ${cash:,.0f} (Liquidity Buffer)
 
 SIMULATION PARAMETERS (The "Knobs"):
-- OpEx Delta: {params.opex_delta_bps} bps (Structural shift in efficiency)
-- Revenue Growth Delta: {params.revenue_growth_bps} bps (Shift in annual growth rate)
-- Discount Rate Delta: {params.discount_rate_bps} bps
+- OpEx Delta: {opex_delta_bps} bps (Structural shift in efficiency)
+- Revenue Growth Delta: {revenue_growth_bps} bps (Shift in annual growth rate)
+- Discount Rate Delta: {discount_rate_bps} bps
 
 SIMULATION OUTPUT (5-Year Forecast):
 {forecast_str}
-- Median NPV: ${simulation.median_npv:,.0f}
+- Median NPV: ${median_npv:,.0f}
 {fcf_section}
 ⚠️ **SIMULATION LOGIC (READ-ONLY):**
 The engine has ALREADY calculated the future.
@@ -205,6 +276,53 @@ The engine has ALREADY calculated the future.
 - Instead, focus on **capital efficiency** (e.g., "Lazy Capital" or ROIC).
 - **DO NOT** claim the company needs external financing if it has massive cash reserves.
 
+⚠️ GUARDRAIL: NEVER claim that FCF data is missing or unavailable. The data is shown above.
+"""
+
+def get_system_prompt(persona, report, simulation, params):
+    """Stable system message: persona followed by the shared scenario data"""
+    return _join_system_prompt(persona, get_debate_context(report, simulation, params))
+
+@lru_cache(maxsize=64)
+@_canonical
+def _join_system_prompt(persona, context):
+    # Both arguments are long-lived strings (interned persona, cached context) whose
+    # hashes are already computed, so a repeat turn is a dict lookup, not a rebuild
+    return f"{persona}\n{context}"
+
+# Appended to every Optimist turn: a machine-checkable summary of the figures the
+# argument rests on, checked locally so most turns need no LLM validation pass
+SELF_CHECK_INSTRUCTIONS = """
+SELF-CHECK: End your answer with this fenced JSON block (it is removed before the skeptic sees your answer):
+```json
+{"claimed_revenue": <the revenue figure your argument leans on, plain number>, "claimed_ebitda": <the EBITDA figure your argument leans on, plain number>, "formula_used": "<one line, e.g. Year 5 EBITDA / Year 5 Revenue>"}
+```
+"""
+
+def get_grounded_figures(report, simulation):
+    """
+    Every dollar figure the opening position may cite, keyed by label and
+    formatted exactly as the debate context prints it
+    """
+    return dict(_format_grounded_figures(PromptNumerics.from_models(report, simulation)))
+
+@lru_cache(maxsize=64)
+def _format_grounded_figures(numerics):
+    figures = [
+        ("Current Revenue", numerics.revenue),
+        ("Current OpEx", numerics.opex),
+        ("Current EBITDA", numerics.ebitda),
+        ("Current Free Cash Flow", numerics.historical_fcf),
+        ("Current Cash Balance", numerics.cash),
+        ("Median NPV", numerics.median_npv),
+    ]
+    for t, (rev, ebitda, fcf) in enumerate(zip(numerics.revenue_p50, numerics.ebitda_p50, numerics.fcf_p50), start=1):
+        figures += [(f"Year {t} Revenue", rev), (f"Year {t} EBITDA", ebitda), (f"Year {t} FCF", fcf)]
+    return tuple((label, f"${value:,.0f}") for label, value in figures)
+
+# Fixed instructions of each turn, assembled once at import. A turn builder only
+# formats its short per-call header (and example figures) and appends these.
+_GEMINI_OPENING_INSTRUCTIONS = """
 ROUND 1: OPENING POSITION
 
 Present your optimistic analysis of this COUNTERFACTUAL timeline.
@@ -212,175 +330,128 @@ Present your optimistic analysis of this COUNTERFACTUAL timeline.
 2. **Use the Explanation Framework**: "Baseline Revenue was X. With the growth delta, it reaches Y in Year 5, driving EBITDA to Z and FCF to W."
 3. **Highlight Long-Term Value**: Connect the simulation numbers to structural improvements (e.g., "Reinvestment today drives leverage tomorrow").
 4. **Reference FCF**: Explicitly cite the year-by-year FCF path as evidence of cash generation potential.
-
-Example: "While near-term FCF shows modest growth, this is consistent with companies reinvesting ahead of a multi-year expansion cycle. As revenue scales from ${simulation.revenue_forecast_p50[0]:,.0f} to ${simulation.revenue_forecast_p50[-1]:,.0f}, fixed costs amortize, supporting operating leverage. The FCF growth to ${simulation.fcf_forecast_p50[-1]:,.0f} in Year 5 validates this trajectory."
 """
 
-def get_deepseek_challenge_prompt(gemini_position, report, simulation, params):
-    """Generate DeepSeek's challenge to Gemini's opening"""
-    
-    # Format forecast data for prompt
-    forecast_str = ""
-    years = range(1, 6)
-    for t, rev, ebitda, fcf in zip(years, simulation.revenue_forecast_p50, simulation.ebitda_forecast_p50, simulation.fcf_forecast_p50):
-        forecast_str += f"Year {t}: Rev ${rev:,.0f} | EBITDA ${ebitda:,.0f} | FCF ${fcf:,.0f}\n"
-    
-    # Add dedicated FCF section
-    historical_fcf = report.cash_flow.FreeCashFlow
-    fcf_section = "\n📊 FREE CASH FLOW TRAJECTORY (Year-by-Year):\n"
-    fcf_section += f"Historical FCF (Baseline): ${historical_fcf:,.0f}\n\n"
-    fcf_section += "Simulated FCF Path:\n"
-    for t, fcf in enumerate(simulation.fcf_forecast_p50, start=1):
-        change_vs_historical = ((fcf - historical_fcf) / historical_fcf * 100) if historical_fcf > 0 else 0
-        fcf_section += f"  • Year {t}: ${fcf:,.0f} ({change_vs_historical:+.1f}% vs historical)\n"
-
-    return f"""
-{DEEPSEEK_PERSONA}
-
-You just heard this optimistic analysis of a COUNTERFACTUAL SIMULATION:
-
-"{gemini_position}"
-
-HISTORICAL REALITY (from PDF):
-- Current Revenue: ${report.income_statement.Revenue:,.0f}
-- Current OpEx: ${report.income_statement.OpEx:,.0f}
-- Current EBITDA: ${report.income_statement.EBITDA:,.0f}
-- Current Free Cash Flow: ${historical_fcf:,.0f}
-- Current Cash Balance: ${report.balance_sheet.Cash:,.0f} (Liquidity Buffer)
-
-SIMULATION PARAMETERS (The "Knobs"):
-- OpEx Delta: {params.opex_delta_bps} bps
-- Revenue Growth Delta: {params.revenue_growth_bps} bps
-- Discount Rate Delta: {params.discount_rate_bps} bps
-
-SIMULATION OUTPUT (5-Year Forecast):
-{forecast_str}
-- Median NPV: ${simulation.median_npv:,.0f}
-{fcf_section}
-⚠️ **SIMULATION LOGIC (READ-ONLY):**
-The engine has ALREADY calculated the future.
-- Revenue grows at (Base Growth + Delta) annually.
-- OpEx scales with Revenue but is shifted by the OpEx Delta.
-- EBITDA = Revenue - COGS - OpEx.
-- FCF = EBIT * (1 - Tax) + D&A - CapEx - Change in WC.
-
-⛔ **STRICT PROHIBITIONS:**
-- **DO NOT** recalculate any numbers. Use the forecast above.
-- **DO NOT** question "how" the numbers were derived. They are facts in this timeline.
-
-⚠️ **SOLVENCY LOGIC GATE:**
-- You are provided with the `Current Cash Balance`.
-- **IF** Cash > 3x (FCF Burn or Negative FCF), **DO NOT** raise solvency/liquidity concerns.
-- Instead, focus on **capital efficiency** (e.g., "Lazy Capital" or ROIC).
-- **DO NOT** claim the company needs external financing if it has massive cash reserves.
-
+_DEEPSEEK_CHALLENGE_INSTRUCTIONS = """
 ROUND 1: CHALLENGE
 
 Challenge the optimistic view by focusing on the **risks** in this timeline.
 1. Analyze the **trend**. Does EBITDA margin compress or expand over time? How does FCF conversion efficiency look?
 2. Use the **Explanation Framework**: "You cite the revenue growth, but notice that OpEx grows faster, compressing margins by Year 5. Meanwhile, FCF only grows from X to Y."
 3. Point out if the NPV relies too heavily on the terminal value vs. near-term cash flow.
-4. Examine the FREE CASH FLOW data provided above - is the cash generation sufficient?
-
-Example: "While revenue grows, the OpEx efficiency drag ({params.opex_delta_bps} bps) compounds. By Year 5, EBITDA is only ${simulation.ebitda_forecast_p50[-1]:,.0f}. More concerning, FCF grows from ${simulation.fcf_forecast_p50[0]:,.0f} to just ${simulation.fcf_forecast_p50[-1]:,.0f}, suggesting the business is capital-intensive and cash generation is weak."
+4. Examine the FREE CASH FLOW data provided - is the cash generation sufficient?
 """
 
-def get_gemini_response_prompt(deepseek_challenge, round_num, debate_context, report=None, simulation=None, params=None):
-    """Generate Gemini's response to DeepSeek's challenge"""
-    
-    # RE-INJECT SIMULATION DATA TO PREVENT AMNESIA
-    data_reminder = ""
-    if report and simulation and params:
-        historical_fcf = report.cash_flow.FreeCashFlow
-        
-        # Build FCF trajectory reminder
-        fcf_reminder = "\n🔥 CRITICAL DATA REMINDER (You have access to this data):\n"
-        fcf_reminder += f"Current Cash Balance: ${report.balance_sheet.Cash:,.0f}\n"
-        fcf_reminder += f"Historical FCF: ${historical_fcf:,.0f}\n"
-        fcf_reminder += "Projected FCF (Year-by-Year):\n"
-        for t, fcf in enumerate(simulation.fcf_forecast_p50, start=1):
-            fcf_reminder += f"  • Year {t}: ${fcf:,.0f}\n"
-        fcf_reminder += f"\nProjected Revenue Year 1-5: ${simulation.revenue_forecast_p50[0]:,.0f} → ${simulation.revenue_forecast_p50[-1]:,.0f}\n"
-        fcf_reminder += f"Projected EBITDA Year 1-5: ${simulation.ebitda_forecast_p50[0]:,.0f} → ${simulation.ebitda_forecast_p50[-1]:,.0f}\n"
-        fcf_reminder += f"Median NPV: ${simulation.median_npv:,.0f}\n"
-        fcf_reminder += "\n⚠️ GUARDRAIL: NEVER claim that FCF data is missing or unavailable. The data is shown above.\n"
-        
-        data_reminder = fcf_reminder
-    
-    return f"""
-{GEMINI_PERSONA}
-
-ROUND {round_num}: RESPONSE
-{data_reminder}
-Your previous statements: {debate_context['gemini_summary']}
-
-The skeptic just challenged you with:
-"{deepseek_challenge}"
-
+_GEMINI_RESPONSE_INSTRUCTIONS = f"""
 **CRITICAL INSTRUCTION - TIMELINE DEFENSE:**
 Defend the counterfactual timeline using the **OPTIMIST RESPONSE TEMPLATE**:
 1. **Address the Concern**: Acknowledge the skeptic's point (e.g., margin compression) but frame it as temporary or investment-driven.
-2. **Provide Data-Backed Argument**: Reference specific FCF or Revenue numbers from the data above.
+2. **Provide Data-Backed Argument**: Reference specific FCF or Revenue numbers from the simulation data.
 3. **Discuss Structural Drivers**: Mention operating leverage, moat strengthening, or secular tailwinds.
 4. **Justify Valuation**: Explain why the long-term outlook (NPV) remains attractive despite near-term risks.
 
-Respond to their concerns directly using the simulation data above.
+Respond to their concerns directly using the simulation data.
 
 ⚠️ **CONSENSUS PHASE (Round 4+):**
 If this is Round 4 or later, and you feel the major points have been addressed:
 - **Seek Convergence**: Acknowledge valid counter-arguments.
 - **Find Common Ground**: Use language like "We can agree that..." or "It is fair to conclude...".
 - **Do not nitpick**: If the core thesis holds, move towards a shared verdict.
+{SELF_CHECK_INSTRUCTIONS}"""
+
+_DEEPSEEK_COUNTER_INSTRUCTIONS = """
+**CRITICAL INSTRUCTION - TIMELINE CRITIQUE:**
+Continue to critique the counterfactual timeline using the simulation data.
+1. Are they ignoring the compounding costs shown in the FCF trajectory?
+2. Is the FCF generation in the early years sufficient? Check the year-by-year data.
+3. Analyze whether FCF growth keeps pace with revenue growth.
+4. Stick to the **Explanation Framework**.
+
+Press them on the *consequences* of the simulation data.
+
+⚠️ **CONSENSUS PHASE (Round 4+):**
+If this is Round 4 or later, and the optimist has conceded valid points:
+- **Seek Convergence**: Acknowledge their concessions.
+- **Find Common Ground**: Use language like "I agree with the assessment that..." or "We are aligned on...".
+- **Do not nitpick**: If the core risks are acknowledged, move towards a shared verdict.
 """
 
-def get_deepseek_counter_prompt(gemini_response, round_num, debate_context, report=None, simulation=None, params=None):
-    """Generate DeepSeek's counter-argument"""
-    
-    # RE-INJECT SIMULATION DATA TO PREVENT AMNESIA
-    data_reminder = ""
-    if report and simulation and params:
-        historical_fcf = report.cash_flow.FreeCashFlow
-        
-        # Build FCF trajectory reminder
-        fcf_reminder = "\n🔥 CRITICAL DATA REMINDER (You have access to this data):\n"
-        fcf_reminder += f"Current Cash Balance: ${report.balance_sheet.Cash:,.0f}\n"
-        fcf_reminder += f"Historical FCF: ${historical_fcf:,.0f}\n"
-        fcf_reminder += "Projected FCF (Year-by-Year):\n"
-        for t, fcf in enumerate(simulation.fcf_forecast_p50, start=1):
-            fcf_reminder += f"  • Year {t}: ${fcf:,.0f}\n"
-        fcf_reminder += f"\nProjected Revenue Year 1-5: ${simulation.revenue_forecast_p50[0]:,.0f} → ${simulation.revenue_forecast_p50[-1]:,.0f}\n"
-        fcf_reminder += f"Projected EBITDA Year 1-5: ${simulation.ebitda_forecast_p50[0]:,.0f} → ${simulation.ebitda_forecast_p50[-1]:,.0f}\n"
-        fcf_reminder += f"Median NPV: ${simulation.median_npv:,.0f}\n"
-        fcf_reminder += "\n⚠️ GUARDRAIL: NEVER claim that FCF data is missing or unavailable. The data is shown above.\n"
-        
-        data_reminder = fcf_reminder
-    
+@_canonical
+def get_gemini_opening_turn(simulation, grounded_figures=None):
+    """Opening instruction for Gemini (Optimist)"""
+    grounded = ""
+    if grounded_figures:
+        grounded = "\nGROUNDED FIGURES (quote dollar amounts exactly as written here - do not round, abbreviate or derive new ones):\n"
+        grounded += "".join(f"- {label}: {value}\n" for label, value in grounded_figures.items())
+    return _GEMINI_OPENING_INSTRUCTIONS + f"""
+Example: "While near-term FCF shows modest growth, this is consistent with companies reinvesting ahead of a multi-year expansion cycle. As revenue scales from ${simulation.revenue_forecast_p50[0]:,.0f} to ${simulation.revenue_forecast_p50[-1]:,.0f}, fixed costs amortize, supporting operating leverage. The FCF growth to ${simulation.fcf_forecast_p50[-1]:,.0f} in Year 5 validates this trajectory."
+{grounded}{SELF_CHECK_INSTRUCTIONS}"""
+
+@_canonical
+def get_deepseek_challenge_turn(gemini_position, simulation, params):
+    """DeepSeek's challenge to Gemini's opening"""
+    return f"""
+You just heard this optimistic analysis of the COUNTERFACTUAL SIMULATION:
+
+"{gemini_position}"
+""" + _DEEPSEEK_CHALLENGE_INSTRUCTIONS + f"""
+Example: "While revenue grows, the OpEx efficiency drag ({params.opex_delta_bps} bps) compounds. By Year 5, EBITDA is only ${simulation.ebitda_forecast_p50[-1]:,.0f}. More concerning, FCF grows from ${simulation.fcf_forecast_p50[0]:,.0f} to just ${simulation.fcf_forecast_p50[-1]:,.0f}, suggesting the business is capital-intensive and cash generation is weak."
+"""
+
+@_canonical
+def get_gemini_response_turn(deepseek_challenge, round_num, debate_context):
+    """Gemini's response to DeepSeek's challenge"""
     return f"""
-{DEEPSEEK_PERSONA}
+ROUND {round_num}: RESPONSE
+
+Your previous statements: {debate_context['gemini_summary']}
 
+The skeptic just challenged you with:
+"{deepseek_challenge}"
+""" + _GEMINI_RESPONSE_INSTRUCTIONS
+
+@_canonical
+def get_deepseek_counter_turn(gemini_response, round_num, debate_context):
+    """DeepSeek's counter-argument"""
+    return f"""
 ROUND {round_num}: COUNTER-ARGUMENT
-{data_reminder}
+
 Your previous challenges: {debate_context['deepseek_summary']}
 
 The optimist responded with:
 "{gemini_response}"
+""" + _DEEPSEEK_COUNTER_INSTRUCTIONS
 
-**CRITICAL INSTRUCTION - TIMELINE CRITIQUE:**
-Continue to critique the counterfactual timeline using the data above.
-1. Are they ignoring the compounding costs shown in the FCF trajectory?
-2. Is the FCF generation in the early years sufficient? Check the year-by-year data above.
-3. Analyze whether FCF growth keeps pace with revenue growth.
-4. Stick to the **Explanation Framework**.
+# Single-string variants (system context + turn) for callers that send one message
+@_canonical
+def get_gemini_opening_prompt(report, simulation, params):
+    """Generate opening statement for Gemini (Optimist)"""
+    return get_system_prompt(GEMINI_PERSONA, report, simulation, params) + get_gemini_opening_turn(simulation)
 
-Press them on the *consequences* of the simulation data shown above.
+@_canonical
+def get_deepseek_challenge_prompt(gemini_position, report, simulation, params):
+    """Generate DeepSeek's challenge to Gemini's opening"""
+    return get_system_prompt(DEEPSEEK_PERSONA, report, simulation, params) + get_deepseek_challenge_turn(gemini_position, simulation, params)
 
-    ⚠️ **CONSENSUS PHASE (Round 4+):**
-    If this is Round 4 or later, and the optimist has conceded valid points:
-    - **Seek Convergence**: Acknowledge their concessions.
-    - **Find Common Ground**: Use language like "I agree with the assessment that..." or "We are aligned on...".
-    - **Do not nitpick**: If the core risks are acknowledged, move towards a shared verdict.
-    """
+@_canonical
+def get_gemini_response_prompt(deepseek_challenge, round_num, debate_context, report=None, simulation=None, params=None):
+    """Generate Gemini's response to DeepSeek's challenge"""
+    if report and simulation and params:
+        system = get_system_prompt(GEMINI_PERSONA, report, simulation, params)
+    else:
+        system = GEMINI_PERSONA + "\n"
+    return system + get_gemini_response_turn(deepseek_challenge, round_num, debate_context)
+
+@_canonical
+def get_deepseek_counter_prompt(gemini_response, round_num, debate_context, report=None, simulation=None, params=None):
+    """Generate DeepSeek's counter-argument"""
+    if report and simulation and params:
+        system = get_system_prompt(DEEPSEEK_PERSONA, report, simulation, params)
+    else:
+        system = DEEPSEEK_PERSONA + "\n"
+    return system + get_deepseek_counter_turn(gemini_response, round_num, debate_context)
 
+@_canonical
 def get_consensus_prompt(debate_history, final_round=False):
     """Generate consensus-building prompt for both agents"""
     if final_round:
@@ -430,6 +501,7 @@ Respond with ONLY:
 - "PARTIAL" if they agree on some but not all major points
 """
 
+@_canonical
 def get_consensus_prompt(debate_history, final_round=False):
     """Generate consensus-building prompt for both agents"""
     if final_round:
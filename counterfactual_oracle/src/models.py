@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+import re
+from bisect import bisect_right
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Dict, List, Optional, Any
 
 # === SOURCE METADATA ===
@@ -189,6 +191,8 @@ class CriticVerdict(BaseModel):
 
 # === DEBATE MODULE MODELS ===
 
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
 class DebateTurn(BaseModel):
     """Represents a single turn in the debate"""
     round_number: int
@@ -197,6 +201,28 @@ class DebateTurn(BaseModel):
     message: str
     timestamp: float
     topic_focus: str = "General Analysis"
+    
+    # Agreement-phrase matches in message, tallied once when the turn is recorded
+    # (None = not yet counted); private, so it stays out of results and caches
+    _agreement_hits: Optional[int] = PrivateAttr(default=None)
+    
+    # Sentence start offsets, segmented once on first use and shared by every
+    # keyword extractor; private, so it is never serialized
+    _sentence_starts: Optional[List[int]] = PrivateAttr(default=None)
+    
+    def sentence_starts(self) -> List[int]:
+        if self._sentence_starts is None:
+            self._sentence_starts = [0] + [m.end() for m in _SENTENCE_BREAK.finditer(self.message)]
+        return self._sentence_starts
+    
+    def sentence_index(self, pos: int) -> int:
+        """Index of the sentence containing character offset pos"""
+        return bisect_right(self.sentence_starts(), pos) - 1
+    
+    def sentence(self, index: int) -> str:
+        starts = self.sentence_starts()
+        end = starts[index + 1] if index + 1 < len(starts) else len(self.message)
+        return self.message[starts[index]:end].strip()
 
 class DebateResult(BaseModel):
     """Complete result of a multi-round debate"""
@@ -204,6 +230,8 @@ class DebateResult(BaseModel):
     total_rounds: int
     converged: bool
     convergence_round: Optional[int] = None
+    # Why the debate ended: "converged", "one_sided" (one view dominated, no agreement) or "max_rounds"
+    stop_reason: str = "max_rounds"
     consensus_summary: str
     key_agreements: List[str] = Field(default_factory=list)
     key_disagreements: List[str] = Field(default_factory=list)
@@ -0,0 +1,130 @@
+"""
+Client-side rate limiting for LLM providers.
+
+Keeps requests inside a provider's requests-per-minute and tokens-per-minute
+budget using a sliding 60 s window, and adapts concurrency AIMD-style:
+each success adds one slot back, each rate-limit error halves the allowance.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Tuple, Type
+
+WINDOW_SECONDS = 60.0
+
+# (requests per minute, tokens per minute)
+PROVIDER_LIMITS = {
+    "openai": (60, 100_000),
+    "deepseek": (60, 100_000),
+    "gemini": (60, 100_000),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting"""
+    return len(text) // 4
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        max_concurrency: int = 8,
+        alpha: float = 1.0,
+        beta: float = 0.5,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.alpha = alpha
+        self.beta = beta
+        self._clock = clock
+        self._window = deque()  # (timestamp, tokens) of requests in the last minute
+        self._window_tokens = 0
+        self._in_flight = 0
+
+    @classmethod
+    def for_provider(cls, provider: str, **kwargs) -> "RateLimiter":
+        rpm, tpm = PROVIDER_LIMITS[provider]
+        return cls(rpm, tpm, **kwargs)
+
+    def _prune(self, now: float):
+        while self._window and now - self._window[0][0] >= WINDOW_SECONDS:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+
+    def _delay(self, est_tokens: int, now: float) -> float:
+        """Seconds to wait before a request of est_tokens may start (0 if it can start now)"""
+        if self._in_flight >= int(self.concurrency):
+            return 0.05  # wait for a release
+        over_rpm = len(self._window) >= self.rpm
+        # A single oversized request is let through on an empty window rather than blocking forever
+        over_tpm = self._window and self._window_tokens + est_tokens > self.tpm
+        if over_rpm or over_tpm:
+            return max(WINDOW_SECONDS - (now - self._window[0][0]), 0.01)
+        return 0.0
+
+    async def acquire(self, est_tokens: int = 0):
+        while True:
+            now = self._clock()
+            self._prune(now)
+            delay = self._delay(est_tokens, now)
+            if delay == 0.0:
+                self._window.append((now, est_tokens))
+                self._window_tokens += est_tokens
+                self._in_flight += 1
+                return
+            await asyncio.sleep(delay)
+
+    def release(self):
+        self._in_flight -= 1
+
+    def on_success(self):
+        """Additive increase"""
+        self.concurrency = min(self.max_concurrency, self.concurrency + self.alpha)
+
+    def on_rate_limited(self):
+        """Multiplicative decrease (never below one slot)"""
+        self.concurrency = max(1.0, self.concurrency * self.beta)
+
+    @asynccontextmanager
+    async def slot(self, est_tokens: int = 0):
+        await self.acquire(est_tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def call(
+        self,
+        request: Callable[[], Awaitable],
+        est_tokens: int = 0,
+        retry_on: Tuple[Type[BaseException], ...] = (),
+        throttle_on: Tuple[Type[BaseException], ...] = (),
+        retries: int = 3,
+        backoff: float = 1.0
+    ):
+        """
+        Run request() inside a slot. Exceptions in retry_on or throttle_on are
+        retried with exponential backoff; only throttle_on ones (429s) also
+        shrink the concurrency allowance. Server errors (5xx) belong in
+        retry_on, since they say nothing about our request rate.
+        """
+        for attempt in range(retries + 1):
+            async with self.slot(est_tokens):
+                try:
+                    result = await request()
+                except throttle_on + retry_on as e:
+                    if isinstance(e, throttle_on):
+                        self.on_rate_limited()
+                    if attempt == retries:
+                        raise
+                else:
+                    self.on_success()
+                    return result
+            await asyncio.sleep(backoff * 2 ** attempt)
@@ -0,0 +1,6 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Caches opened by a test (e.g. a DebateAgent's defaults) live under its tmp_path, not the real cache"""
+    monkeypatch.setenv("ORACLE_CACHE_DIR", str(tmp_path / "cache"))
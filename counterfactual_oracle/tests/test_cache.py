@@ -0,0 +1,39 @@
+import os
+from counterfactual_oracle.src.models import ScenarioParams
+from counterfactual_oracle.src.cache import DiskCache, make_key, quantize_params
+
+def test_nearby_scenarios_share_bucket():
+    a = ScenarioParams(opex_delta_bps=-3, revenue_growth_bps=4)
+    b = ScenarioParams(opex_delta_bps=4, revenue_growth_bps=-3)
+    assert quantize_params(a) == quantize_params(b)
+
+def test_distant_scenarios_differ():
+    a = ScenarioParams(opex_delta_bps=0)
+    b = ScenarioParams(opex_delta_bps=50)
+    assert quantize_params(a) != quantize_params(b)
+
+def test_make_key_is_stable():
+    assert make_key("report", (0, 1, 2, 0)) == make_key("report", (0, 1, 2, 0))
+    assert make_key("report", (0, 1, 2, 0)) != make_key("report", (0, 1, 3, 0))
+
+def test_roundtrip_and_expiry(tmp_path):
+    cache = DiskCache("test", directory=str(tmp_path))
+    assert cache.get("k") is None
+    cache.set("k", '{"verdict": "approve"}')
+    assert cache.get("k") == '{"verdict": "approve"}'
+
+    # Backdate the entry past its ttl
+    path = cache._file("k")
+    os.utime(path, (0, 0))
+    assert cache.get("k") is None
+
+def test_sharded_layout(tmp_path):
+    cache = DiskCache("debates", directory=str(tmp_path), shard=True)
+    key = make_key("report", (0, 1, 2, 0))
+    cache.set(key, "{}")
+    assert cache._file(key) == os.path.join(str(tmp_path), "debates", key[:2], f"{key}.json")
+    assert cache.get(key) == "{}"
+
+def test_cache_dir_follows_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("ORACLE_CACHE_DIR", str(tmp_path / "elsewhere"))
+    assert DiskCache("test").path == os.path.join(str(tmp_path), "elsewhere", "test")
@@ -0,0 +1,139 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from counterfactual_oracle.src.agents import debate_agent as debate_module
+from counterfactual_oracle.src.agents.debate_agent import DebateAgent
+
+def test_run_debates_bounds_concurrency_and_keeps_order():
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    running, peak = 0, 0
+
+    async def fake_debate(report, simulation, params, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        # Later scenarios finish first
+        await asyncio.sleep(0.01 * (5 - params))
+        running -= 1
+        return params, kwargs["max_rounds"]
+
+    agent.arun_debate = fake_debate
+    scenarios = [(None, None, i) for i in range(5)]
+    results = agent.run_debates(scenarios, max_concurrency=2, max_rounds=3)
+    assert results == [(i, 3) for i in range(5)]
+    assert peak == 2
+
+class FakeBatchAPI:
+    """files/batches endpoints of an OpenAI client; jobs complete on the second poll"""
+    def __init__(self, rows):
+        self.rows = rows
+        self.uploaded = None
+        self.created = []
+        self.polls = 0
+        self.files = SimpleNamespace(create=self.upload, content=self.content)
+        self.batches = SimpleNamespace(create=self.create, list=self.list, cancel=None)
+
+    async def upload(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = [json.loads(line) for line in file[1].decode().splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    async def create(self, input_file_id, endpoint, completion_window):
+        self.created.append(f"batch-{len(self.created) + 1}")
+        return SimpleNamespace(id=self.created[-1], status="validating", output_file_id=None)
+
+    async def list(self, limit):
+        self.polls += 1
+        if self.polls < 2:
+            return SimpleNamespace(data=[SimpleNamespace(id=i, status="in_progress", output_file_id=None) for i in self.created])
+        return SimpleNamespace(data=[SimpleNamespace(id=i, status="completed", output_file_id="file-out") for i in self.created])
+
+    async def content(self, file_id):
+        return SimpleNamespace(text="\n".join(json.dumps(row) for row in self.rows))
+
+def test_batch_openings_map_results_back_by_custom_id(monkeypatch):
+    async def no_sleep(*args, **kwargs):
+        pass
+    monkeypatch.setattr(debate_module.asyncio, "sleep", no_sleep)
+
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    reply = lambda text: {"body": {"choices": [{"message": {"content": text}}]}}
+    api = FakeBatchAPI([
+        {"custom_id": "1", "response": reply("second")},
+        {"custom_id": "0", "response": reply("first")},
+        {"custom_id": "2", "response": None, "error": {"message": "failed"}},
+    ])
+    agent.openai = api
+    agent._opening_messages = lambda report, simulation, params: ([{"role": "user", "content": params}], {})
+
+    openings = asyncio.run(agent.batch_openings([(None, None, "a"), (None, None, "b"), (None, None, "c")]))
+    assert openings == ["first", "second", None]
+    assert [row["custom_id"] for row in api.uploaded] == ["0", "1", "2"]
+    assert api.uploaded[1]["body"]["messages"] == [{"role": "user", "content": "b"}]
+
+def test_cached_scenarios_are_left_out_of_the_opening_batch():
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    agent._debate_keys = lambda report, simulation, params, max_rounds, convergence_threshold: (params, params)
+    agent._cached_debate = lambda keys, semantic_cache: "stored" if keys[0] == "b" else None
+    batched = []
+
+    async def fake_batch(scenarios):
+        batched.append([params for _, _, params in scenarios])
+        return [f"opening {params}" for _, _, params in scenarios]
+
+    async def fake_debate(report, simulation, params, opening=None, **kwargs):
+        return params, opening
+
+    agent.batch_openings = fake_batch
+    agent.arun_debate = fake_debate
+    results = agent.run_debates([(None, None, "a"), (None, None, "b"), (None, None, "c")], batch_openings=True)
+    assert batched == [["a", "c"]]
+    assert results == [("a", "opening a"), ("b", None), ("c", "opening c")]
+
+    # Nothing to batch when every debate is cached, or none when the cache is bypassed
+    agent._cached_debate = lambda keys, semantic_cache: "stored"
+    agent.run_debates([(None, None, "a")], batch_openings=True)
+    agent.run_debates([(None, None, "b")], batch_openings=True, use_cache=False)
+    assert batched == [["a", "c"], ["b"]]
+
+def test_concurrent_batches_share_one_poller(monkeypatch):
+    async def no_sleep(*args, **kwargs):
+        pass
+    monkeypatch.setattr(debate_module.asyncio, "sleep", no_sleep)
+
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    api = FakeBatchAPI([])
+    agent.openai = api
+
+    async def run():
+        jobs = [await api.create("file-in", "/v1/chat/completions", "24h") for _ in range(3)]
+        return await asyncio.gather(*(agent._wait_for_batch(job, timeout=60) for job in jobs))
+    finished = asyncio.run(run())
+    assert [b.status for b in finished] == ["completed"] * 3
+    # One list request per tick covers every waiting job
+    assert api.polls == 2
+    assert agent._batch_waiters == {}
+
+def test_agent_closes_shared_connection_pool():
+    async def run():
+        async with DebateAgent(openai_api_key="test", deepseek_api_key="test") as agent:
+            assert not agent._http.is_closed
+        return agent
+    agent = asyncio.run(run())
+    assert agent._http.is_closed
+
+def test_sync_runs_each_get_a_fresh_pool():
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    pools = []
+
+    async def fake_debate(report, simulation, params, **kwargs):
+        assert not agent._http.is_closed
+        pools.append(agent._http)
+        return params
+    agent.arun_debate = fake_debate
+
+    # The same agent can be driven by successive asyncio.run calls
+    assert agent.run_debate(None, None, "a") == "a"
+    assert agent.run_debates([(None, None, "b")]) == ["b"]
+    assert pools[0] is not pools[1]
+    assert all(pool.is_closed for pool in pools)
@@ -0,0 +1,239 @@
+import asyncio
+from counterfactual_oracle.src.models import DebateTurn
+from counterfactual_oracle.src.agents.debate_agent import DebateAgent
+
+def make_turn(message, speaker="OpenAI", round_number=1):
+    role = "Optimist" if speaker == "OpenAI" else "Skeptic"
+    return DebateTurn(round_number=round_number, speaker=speaker, role=role, message=message, timestamp=0.0)
+
+def make_agent():
+    return DebateAgent(openai_api_key="test", deepseek_api_key="test")
+
+def test_extract_agreements_returns_whole_sentences():
+    log = [make_turn("Margins expand. I agree the FCF path is credible! Risk remains.")]
+    assert make_agent()._extract_agreements(log) == ["I agree the FCF path is credible!"]
+
+def test_extract_disagreements_newest_first():
+    log = [
+        make_turn("However, capex is heavy.", speaker="DeepSeek", round_number=1),
+        make_turn("I disagree with the terminal value.", speaker="DeepSeek", round_number=2),
+    ]
+    assert make_agent()._extract_disagreements(log) == [
+        "I disagree with the terminal value.",
+        "However, capex is heavy.",
+    ]
+
+def test_one_sentence_reported_once():
+    log = [make_turn("I agree, and we can agree on margins.")]
+    assert make_agent()._extract_agreements(log) == ["I agree, and we can agree on margins."]
+
+def test_determine_verdict_counts_distinct_keywords():
+    bullish = [make_turn("Strong growth, clear upside and a confident outlook.")]
+    bearish = [make_turn("Weak demand, downside risk and a negative trend.")]
+    agent = make_agent()
+    assert agent._determine_verdict(bullish, converged=True) == "Buy"
+    assert agent._determine_verdict(bearish, converged=False) == "Cautious Sell"
+
+def test_convergence_is_judged_by_the_llm_without_agreement_phrases():
+    agent = make_agent()
+    prompts = []
+
+    async def judge(provider, model, messages, temperature, **kwargs):
+        prompts.append(messages[0]["content"])
+        return "CONVERGED"
+    agent._cached_call = judge
+
+    # Paraphrased agreement, none of the AGREEMENT_KEYWORDS: the LLM still decides
+    log = [make_turn("You're right that margins hold up.", round_number=i) for i in range(4)]
+    assert asyncio.run(agent._check_convergence(log)) is True
+    assert len(prompts) == 1 and "margins hold up" in prompts[0]
+
+def test_consensus_fallback_verdict_is_hold():
+    agent = make_agent()
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("provider down")
+    agent._cached_call = fail
+
+    log = [make_turn("Strong growth and clear upside. I agree it is a buy.", round_number=4)]
+    consensus = asyncio.run(agent._synthesize_consensus(log, converged=False))
+    assert consensus["verdict"] == "Hold" and consensus["fallback"]
+    assert consensus["agreements"] == ["I agree it is a buy."]
+
+def test_consensus_replayed_only_when_well_formed():
+    from types import SimpleNamespace
+
+    agent = make_agent()
+    replies = iter(["not json", '```json\n{"verdict": "Buy"}\n```'])
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs["temperature"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=next(replies)))])
+    agent.openai = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    log = [make_turn("Upside.")]
+    # Malformed reply falls back and is not cached; the good one is, and is then replayed
+    assert asyncio.run(agent._synthesize_consensus(log, converged=True))["confidence"] == "Low"
+    assert asyncio.run(agent._synthesize_consensus(log, converged=True))["verdict"] == "Buy"
+    assert asyncio.run(agent._synthesize_consensus(log, converged=True))["verdict"] == "Buy"
+    assert calls == [0.0, 0.0]
+
+def test_keywords_match_regardless_of_case():
+    agent = make_agent()
+    log = [make_turn("Margins hold. HOWEVER, Capex is heavy.", speaker="DeepSeek")]
+    assert agent._extract_disagreements(log) == ["HOWEVER, Capex is heavy."]
+    assert agent._determine_verdict([make_turn("STRONG Growth and Upside.")], converged=True) == "Buy"
+
+def test_determine_verdict_uses_running_tally():
+    agent = make_agent()
+    log = [make_turn("Weak demand, downside risk and a negative trend.")]
+    # The tally recorded during the debate is trusted over rescanning the log
+    assert agent._determine_verdict(log, converged=True, sentiment_terms={"growth", "upside"}) == "Buy"
+
+def test_sharpest_counter_prefers_push_back():
+    agent = make_agent()
+    mild = "Revenue growth looks plausible over the forecast horizon and margins are steady."
+    pointed = "However, capex is heavy. I disagree with the terminal value."
+    assert agent._sharpest([mild, pointed]) == pointed
+    assert agent._sharpest(["However, short.", "However, a longer point."]) == "However, a longer point."
+
+def test_agreement_hits_counted_once_per_turn():
+    agent = make_agent()
+    turn = make_turn("I agree, and we can agree on margins.")
+    assert agent._agreement_hits(turn) == 2
+    # Stored on the turn, so later convergence checks don't rescan the message
+    turn.message = "Revenue grows."
+    assert agent._agreement_hits(turn) == 2
+    # Not part of the public model, so never serialized into results or caches
+    assert "agreement_hits" not in turn.model_dump()
+
+def test_repeated_sentences_across_turns_reported_once():
+    log = [
+        make_turn("I agree the FCF path is credible.", round_number=1),
+        make_turn("Fair point on capex. I agree the FCF path is credible.", round_number=2),
+    ]
+    assert make_agent()._extract_agreements(log) == [
+        "Fair point on capex.",
+        "I agree the FCF path is credible.",
+    ]
+
+def test_record_scan_matches_separate_scanners():
+    agent = make_agent()
+    message = "I agree the upside is real. Fair point on risk, but growth is STRONG and we can agree on it."
+    turn = make_turn(message)
+    assert agent._scan_turn(message) == (agent._agreement_hits(turn), agent._sentiment_terms(message))
+
+def test_parse_json_reply_handles_fences():
+    from counterfactual_oracle.src.agents.debate_agent import _parse_json_reply
+    assert _parse_json_reply('{"verdict": "Buy"}') == {"verdict": "Buy"}
+    assert _parse_json_reply('Here:\n```json\n{"verdict": "Buy"}\n```\nDone.') == {"verdict": "Buy"}
+    assert _parse_json_reply('```\n{"verdict": "Hold"}\n```') == {"verdict": "Hold"}
+    assert _parse_json_reply('```json\n{"verdict": "Sell"}') == {"verdict": "Sell"}
+
+def test_one_sided_needs_full_window_and_ratio():
+    agent = make_agent()
+    bullish = [{"growth"}, {"upside"}, {"strong", "upside"}, set()]
+    assert agent._is_one_sided(bullish[:3]) is False
+    assert agent._is_one_sided(bullish) is True
+    # 3 positive vs 1 negative still clears 3x; 3 vs 2 does not
+    assert agent._is_one_sided(bullish[:3] + [{"risk"}]) is True
+    assert agent._is_one_sided(bullish[:3] + [{"risk", "weak"}]) is False
+
+def test_consensus_fast_path_skips_synthesis_call():
+    agent = make_agent()
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("LLM should not be called")
+    agent._cached_call = fail
+
+    log = [
+        make_turn("I agree: strong growth, clear upside, a buy.", round_number=4),
+        make_turn("Fair point. We can agree the outlook is positive and I am confident.", speaker="DeepSeek", round_number=4),
+    ]
+    consensus = asyncio.run(agent._synthesize_consensus(log, converged=True))
+    assert consensus["verdict"] == "Buy" and consensus["confidence"] == "High"
+    assert consensus["agreements"][:2] == ["Fair point.", "We can agree the outlook is positive and I am confident."]
+
+    # Not converged, or too balanced: the LLM synthesis is still needed
+    assert agent._fast_consensus(log, converged=False) is None
+    log[1] = make_turn("Fair point. We can agree, though risk remains.", speaker="DeepSeek", round_number=4)
+    assert agent._fast_consensus(log, converged=True) is None
+
+def run_stubbed_debate(tmp_path, message, converging, counters=None, params=None, use_cache=False, semantic_cache=False, num_simulations=50):
+    """arun_debate on the sample report with every LLM step stubbed: each turn says `message`"""
+    import json, os
+    from counterfactual_oracle.src.cache import DiskCache
+    from counterfactual_oracle.src.logic import run_monte_carlo
+    from counterfactual_oracle.src.models import FinancialReport, ScenarioParams
+
+    path = os.path.join(os.path.dirname(__file__), "..", "data", "sample_report.json")
+    report = FinancialReport.model_validate(json.load(open(path)))
+    params = params or ScenarioParams()
+    simulation = run_monte_carlo(report, params, num_simulations=num_simulations)
+
+    agent = make_agent()
+    agent._debates = DiskCache("debates", directory=str(tmp_path))
+
+    async def reply(*args, **kwargs):
+        return message
+
+    async def counter(*args, **kwargs):
+        if counters is not None:
+            counters.append(args[1])
+        return message
+
+    async def check_convergence(log):
+        return converging
+
+    async def consensus(log, converged):
+        return {"summary": "", "agreements": [], "disagreements": [], "verdict": "Hold", "confidence": "Low"}
+
+    agent._get_validated_optimist_position = reply
+    agent._get_deepseek_challenge = reply
+    agent._get_validated_optimist_response = reply
+    agent._get_deepseek_counter = counter
+    agent._check_convergence = check_convergence
+    agent._synthesize_consensus = consensus
+    return asyncio.run(agent.arun_debate(
+        report, simulation, params, convergence_threshold=2, use_cache=use_cache, semantic_cache=semantic_cache
+    ))
+
+def test_converging_round_skips_the_counter(tmp_path):
+    counters = []
+    result = run_stubbed_debate(tmp_path, "Revenue grows.", converging=True, counters=counters)
+    assert result.converged and result.convergence_round == 3 and result.stop_reason == "converged"
+    # Round 2 still needs its counter; round 3 converges and never asks for one
+    assert counters == [2]
+
+def test_one_sided_stop_is_not_reported_as_convergence(tmp_path):
+    result = run_stubbed_debate(tmp_path, "Strong growth and clear upside.", converging=False)
+    assert result.stop_reason == "one_sided" and result.total_rounds == 3
+    assert not result.converged and result.convergence_round is None
+
+def test_same_scenario_replays_stored_debate(tmp_path):
+    first = run_stubbed_debate(tmp_path, "Revenue grows.", converging=False)
+    counters = []
+    replay = run_stubbed_debate(tmp_path, "Other text.", converging=False, counters=counters, use_cache=True)
+    assert counters == [] and replay.debate_log[0].message == first.debate_log[0].message
+
+    # A different simulation of the same scenario is debated afresh
+    rerun = run_stubbed_debate(tmp_path, "Other text.", converging=False, use_cache=True, num_simulations=40)
+    assert rerun.debate_log[0].message == "Other text."
+
+def test_nearby_scenario_replays_only_with_semantic_cache(tmp_path):
+    from counterfactual_oracle.src.models import ScenarioParams
+    run_stubbed_debate(tmp_path, "Revenue grows.", converging=False, params=ScenarioParams(opex_delta_bps=-3))
+    # Same 10 bp bucket, but by default only an exact match is replayed
+    fresh = run_stubbed_debate(
+        tmp_path, "Other text.", converging=False, params=ScenarioParams(opex_delta_bps=4), use_cache=True
+    )
+    assert fresh.debate_log[0].message == "Other text."
+
+    counters = []
+    replay = run_stubbed_debate(
+        tmp_path, "Third text.", converging=False, counters=counters,
+        params=ScenarioParams(opex_delta_bps=4), use_cache=True, semantic_cache=True
+    )
+    # The latest debate stored for the bucket
+    assert counters == [] and replay.debate_log[0].message == "Other text."
@@ -0,0 +1,78 @@
+"""
+Prompt Assembly Tests
+
+Prompts must be byte-identical for identical inputs so provider prefix caches hit.
+"""
+
+import hashlib
+from counterfactual_oracle.src import debate_prompts
+from counterfactual_oracle.src.debate_prompts import (
+    GEMINI_PERSONA, _canonicalize, get_system_prompt, get_gemini_response_turn
+)
+from counterfactual_oracle.src.models import (
+    FinancialReport, IncomeStatement, BalanceSheet, CashFlow, ScenarioParams
+)
+from counterfactual_oracle.src.logic import run_monte_carlo
+
+def make_report():
+    return FinancialReport(
+        income_statement=IncomeStatement(
+            Revenue=100000, CostOfGoodsSold=60000, GrossProfit=40000, OpEx=20000,
+            EBITDA=20000, DepreciationAndAmortization=5000, EBIT=15000,
+            InterestExpense=1000, Taxes=3500, NetIncome=10500
+        ),
+        balance_sheet=BalanceSheet(
+            Assets={"TotalAssets": 200000},
+            Liabilities={"TotalLiabilities": 100000},
+            Equity={"TotalEquity": 100000},
+            Cash=50000
+        ),
+        cash_flow=CashFlow(
+            NetIncome=10500, Depreciation=5000, ChangeInWorkingCapital=1000,
+            CashFromOperations=15000, CapEx=-5000, CashFromInvesting=-5000,
+            DebtRepayment=0, Dividends=0, CashFromFinancing=0,
+            NetChangeInCash=10000, FreeCashFlow=10000
+        ),
+        kpis={"TaxRate": 0.25}
+    )
+
+def sha256(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def test_canonicalize_normalizes_whitespace():
+    assert _canonicalize("a  \r\nb\t\r\n\n\n") == "a\nb\n"
+    assert _canonicalize(_canonicalize("a \nb")) == _canonicalize("a \nb")
+
+def test_system_prompt_is_byte_stable():
+    report, params = make_report(), ScenarioParams(revenue_growth_bps=100)
+    simulation = run_monte_carlo(report, params, num_simulations=50)
+
+    first = sha256(get_system_prompt(GEMINI_PERSONA, report, simulation, params))
+    # Rebuild from scratch (equal but distinct objects, cold context cache)
+    debate_prompts._render_debate_context.cache_clear()
+    rebuilt = simulation.model_copy(deep=True)
+    assert sha256(get_system_prompt(GEMINI_PERSONA, make_report(), rebuilt, ScenarioParams(revenue_growth_bps=100))) == first
+
+def test_turn_prompt_has_no_trailing_whitespace():
+    turn = get_gemini_response_turn("Capex is heavy.  ", 2, {"gemini_summary": "Growth is strong. "})
+    assert all(line == line.rstrip() for line in turn.split("\n"))
+    assert turn.endswith("\n") and not turn.endswith("\n\n")
+
+def test_system_prompt_reused_across_turns():
+    report, params = make_report(), ScenarioParams(revenue_growth_bps=100)
+    simulation = run_monte_carlo(report, params, num_simulations=50)
+    # Same persona and scenario: the joined prompt is served from cache, not rebuilt
+    first = get_system_prompt(GEMINI_PERSONA, report, simulation, params)
+    assert get_system_prompt(GEMINI_PERSONA, report, simulation, params) is first
+
+def test_grounded_figures_formatted_once_per_scenario():
+    report, params = make_report(), ScenarioParams(revenue_growth_bps=100)
+    simulation = run_monte_carlo(report, params, num_simulations=50)
+    debate_prompts._format_grounded_figures.cache_clear()
+    figures = debate_prompts.get_grounded_figures(report, simulation)
+    assert figures["Current Revenue"] == "$100,000" and len(figures) == 6 + 3 * 5
+    # Equal figures from a rebuilt simulation hit the cache; callers get their own dict
+    figures["Current Revenue"] = "changed"
+    again = debate_prompts.get_grounded_figures(make_report(), simulation.model_copy(deep=True))
+    assert again["Current Revenue"] == "$100,000"
+    assert debate_prompts._format_grounded_figures.cache_info().hits == 1
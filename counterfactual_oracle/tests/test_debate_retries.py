@@ -0,0 +1,201 @@
+import asyncio
+from types import SimpleNamespace
+from counterfactual_oracle.src.agents import debate_agent as debate_module
+from counterfactual_oracle.src.agents.debate_agent import DebateAgent
+
+async def no_sleep(*args, **kwargs):
+    pass
+
+def make_agent(monkeypatch, replies, valid):
+    """Agent whose LLM returns `replies` in order and whose validator accepts texts in `valid`"""
+    monkeypatch.setattr(debate_module.asyncio, "sleep", no_sleep)
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    agent.sent = []
+    agent.temperatures = []
+    replies = iter(replies)
+
+    async def fake_stream(provider, model, messages, temperature, check=None):
+        agent.sent.append(messages)
+        agent.temperatures.append(temperature)
+        return next(replies), None
+
+    async def fake_validate(text, report, simulation):
+        ok = text in valid
+        return {"is_valid": ok, "issues": [] if ok else ["made-up number"], "feedback": "use the data"}
+
+    agent._stream_call = fake_stream
+    agent.validator.avalidate_statement = fake_validate
+    return agent
+
+BASE = [{"role": "system", "content": "context"}, {"role": "user", "content": "turn"}]
+
+def test_first_valid_speculative_attempt_wins(monkeypatch):
+    agent = make_agent(monkeypatch, ["bad", "good"], valid={"good"})
+    assert asyncio.run(agent._speculative_optimist(BASE, None, None)) == "good"
+    assert len(agent.sent) == 2
+    # Raced attempts sample at different temperatures
+    assert sorted(agent.temperatures) == sorted(debate_module.SPECULATIVE_TEMPERATURES)
+
+def test_feedback_retry_keeps_prefix(monkeypatch):
+    agent = make_agent(monkeypatch, ["bad", "worse", "fixed"], valid={"fixed"})
+    assert asyncio.run(agent._speculative_optimist(BASE, None, None)) == "fixed"
+
+    retry = agent.sent[-1]
+    assert retry[:2] == BASE
+    assert retry[2]["role"] == "assistant"
+    assert retry[3]["role"] == "user" and "[SYSTEM FEEDBACK]" in retry[3]["content"]
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed == len(self.chunks):
+            raise StopAsyncIteration
+        self.consumed += 1
+        delta = SimpleNamespace(content=self.chunks[self.consumed - 1])
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        self.closed = True
+
+def test_stream_abandoned_once_quick_check_fails():
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    # The blocked phrase is split across deltas
+    stream = FakeStream(["Growth from a new prod", "uct launch ", "drives ", "upside ", "for years."])
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return stream
+    agent.openai = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    check = lambda text: agent.validator.quick_check(text)
+    text, rejection = asyncio.run(agent._stream_call("openai", "gpt-4-turbo", BASE, 0.7, check))
+    assert rejection is not None and not rejection["is_valid"]
+    assert text == "Growth from a new product launch "
+    assert stream.consumed == 2 and stream.closed
+
+def test_stream_checks_only_a_bounded_tail(monkeypatch):
+    monkeypatch.setattr(debate_module, "STREAM_TAIL_CHARS", 20)
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    stream = FakeStream(["x" * 100, "y" * 100, "z" * 100])
+
+    async def create(**kwargs):
+        return stream
+    agent.openai = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    windows = []
+    check = lambda text: windows.append(len(text))
+    text, rejection = asyncio.run(agent._stream_call("openai", "gpt-4-turbo", BASE, 0.7, check))
+    assert rejection is None and len(text) == 300
+    assert windows == [100, 120, 120]
+
+def test_grounding_check_rejects_invented_figures():
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    grounded = {"$100,000", "$12,500"}
+    assert agent.validator.grounding_check("Revenue of $100,000, FCF of $12,500.", grounded) is None
+
+    rejection = agent.validator.grounding_check("Revenue reaches $140,000 by Year 5.", grounded)
+    assert rejection["issues"] == ["Cited figure not in the data: $140,000"]
+
+    # A figure cut off mid-stream is not judged yet
+    assert agent.validator.grounding_check("Revenue of $100,000 grows to $12", grounded, partial=True) is None
+
+def test_grounding_check_accepts_negative_figures_either_way_round():
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    grounded = {"$-508,647", "$12,500"}
+    assert agent.validator.grounding_check("FCF is -$508,647 today.", grounded) is None
+    assert agent.validator.grounding_check("FCF is $-508,647 today.", grounded) is None
+
+    # The sign is part of the figure: the positive amount was never reported
+    rejection = agent.validator.grounding_check("FCF swings to $508,647.", grounded)
+    assert rejection["issues"] == ["Cited figure not in the data: $508,647"]
+    assert agent.validator.grounding_check("FCF is -$12,500.", grounded) is not None
+    # A hyphen after a figure is a range, not a sign
+    assert agent.validator.grounding_check("Between $12,500-$12,500.", grounded) is None
+
+def test_self_check_block_is_stripped_and_verified_locally(monkeypatch):
+    simulation = SimpleNamespace(
+        median_npv=80_000, median_revenue=105_000, median_ebitda=21_000,
+        revenue_forecast_p50=[103_000, 115_900], ebitda_forecast_p50=[20_600, 23_044], fcf_forecast_p50=[10_200, 11_000]
+    )
+    report = SimpleNamespace(
+        income_statement=SimpleNamespace(Revenue=100_000, OpEx=20_000, EBITDA=20_000, NetIncome=10_500),
+        cash_flow=SimpleNamespace(FreeCashFlow=10_000), balance_sheet=SimpleNamespace(Cash=50_000)
+    )
+    block = '\n```json\n{"claimed_revenue": 115900, "claimed_ebitda": 23044, "formula_used": "Year 5 EBITDA / Year 5 Revenue"}\n```'
+    prose = "Revenue reaches $115,900 and EBITDA $23,044 by Year 2."
+    # The LLM validator would reject everything; a locally verified answer never reaches it
+    agent = make_agent(monkeypatch, [prose + block], valid=set())
+    assert asyncio.run(agent._speculative_optimist(BASE, report, simulation, parallel=1)) == prose
+    assert len(agent.sent) == 1
+
+    # Claims that hold don't vouch for invented figures in the prose: that goes to the LLM
+    invented = "Revenue reaches $115,900, and a new channel adds $40,000."
+    agent = make_agent(monkeypatch, [invented + block, "fixed"], valid={"fixed"})
+    assert asyncio.run(agent._speculative_optimist(BASE, report, simulation, parallel=1)) == "fixed"
+
+    rejection = agent.validator.check_claims({"claimed_revenue": 150_000, "claimed_ebitda": 23_044}, report, simulation)
+    assert rejection["issues"] == ["claimed_revenue 150,000 does not match the data", "Missing formula_used"]
+
+def test_local_check_skips_llm_for_data_figures_only():
+    agent = DebateAgent(openai_api_key="test", deepseek_api_key="test")
+    report = SimpleNamespace(
+        income_statement=SimpleNamespace(Revenue=100_000, OpEx=20_000, EBITDA=20_000, NetIncome=10_500),
+        # Optional figures missing from the report are skipped
+        cash_flow=SimpleNamespace(FreeCashFlow=None), balance_sheet=SimpleNamespace(Cash=None)
+    )
+    simulation = SimpleNamespace(
+        median_npv=80_000, median_revenue=105_000, median_ebitda=21_000,
+        revenue_forecast_p50=[103_000, 115_900], ebitda_forecast_p50=[20_600, 23_044], fcf_forecast_p50=[10_200, 11_000]
+    )
+
+    async def fail(**kwargs):
+        raise AssertionError("LLM should not be called")
+    agent.validator.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=fail)))
+
+    result = asyncio.run(agent.validator.avalidate_statement("Revenue grows from $100,000 to $115,900 by Year 5.", report, simulation))
+    assert result["is_valid"]
+
+    # Within tolerance of a data figure is fine; off-data, derived or abbreviated figures need the LLM
+    assert agent.validator.local_check("FCF of $11,050.", report, simulation)
+    assert agent.validator.local_check("EBITDA of 20,600 in Year 1.", report, simulation)
+    for statement in (
+        "Revenue reaches $140,000.", "Margins widen to 22%.", "Revenue of $0.1M.",
+        "EBITDA is 999,999,999.", "No figures at all, demand is surging."
+    ):
+        assert not agent.validator.local_check(statement, report, simulation)
+
+def test_sync_validate_uses_a_client_per_call(monkeypatch):
+    from counterfactual_oracle.src.agents import validator as validator_module
+    clients = []
+
+    class FakeClient:
+        def __init__(self, api_key):
+            self.closed = False
+            clients.append(self)
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+        async def create(self, **kwargs):
+            content = '{"is_valid": true, "issues": [], "feedback": ""}'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.closed = True
+
+    validator = validator_module.RealismValidatorAgent(api_key="test")
+    monkeypatch.setattr(validator_module, "AsyncOpenAI", FakeClient)
+    report = SimpleNamespace(income_statement=SimpleNamespace(Revenue=1, OpEx=1, EBITDA=1, NetIncome=1))
+    simulation = SimpleNamespace(median_npv=1, median_revenue=1, median_ebitda=1)
+    # Repeated sync calls each run on a fresh event loop with their own client
+    for _ in range(2):
+        assert validator.validate_statement("Margins widen to 22%.", report, simulation)["is_valid"]
+    assert len(clients) == 2 and all(c.closed for c in clients)
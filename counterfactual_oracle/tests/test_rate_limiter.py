@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from counterfactual_oracle.src import rate_limiter as rl
+from counterfactual_oracle.src.rate_limiter import RateLimiter, estimate_tokens
+
+class FakeClock:
+    """Virtual time: asyncio.sleep advances the clock instead of waiting"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rl.asyncio, "sleep", fake.sleep)
+    return fake
+
+class Throttled(Exception):
+    pass
+
+def test_estimate_tokens():
+    assert estimate_tokens("a" * 400) == 100
+
+def test_rpm_window_delays_excess_requests(clock):
+    limiter = RateLimiter(rpm=2, tpm=10_000, clock=clock)
+
+    async def run():
+        for _ in range(3):
+            async with limiter.slot():
+                pass
+    asyncio.run(run())
+    # Third request had to wait for the first to leave the 60 s window
+    assert clock.now >= 60.0
+
+def test_tpm_budget_delays_large_requests(clock):
+    limiter = RateLimiter(rpm=100, tpm=1_000, clock=clock)
+
+    async def run():
+        async with limiter.slot(est_tokens=800):
+            pass
+        async with limiter.slot(est_tokens=800):
+            pass
+    asyncio.run(run())
+    assert clock.now >= 60.0
+
+def test_aimd_halves_on_throttle_and_recovers(clock):
+    limiter = RateLimiter(rpm=100, tpm=100_000, max_concurrency=8, clock=clock)
+    calls = []
+
+    async def flaky():
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise Throttled()
+        return "ok"
+
+    result = asyncio.run(limiter.call(flaky, throttle_on=(Throttled,), backoff=1.0))
+    assert result == "ok"
+    assert len(calls) == 3
+    # 8 -> 4 -> 2, then +1 on success
+    assert limiter.concurrency == 3.0
+    # Exponential backoff between attempts: 1 s then 2 s
+    assert calls[1] - calls[0] == 1.0 and calls[2] - calls[1] == 2.0
+
+def test_gives_up_after_retries(clock):
+    limiter = RateLimiter(rpm=100, tpm=100_000, clock=clock)
+
+    async def always_throttled():
+        raise Throttled()
+
+    with pytest.raises(Throttled):
+        asyncio.run(limiter.call(always_throttled, throttle_on=(Throttled,), retries=2))
+    assert limiter.concurrency == 1.0
+
+class ServerError(Exception):
+    pass
+
+def test_server_errors_retry_without_shrinking(clock):
+    limiter = RateLimiter(rpm=100, tpm=100_000, max_concurrency=8, clock=clock)
+    calls = []
+
+    async def flaky():
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise ServerError()
+        return "ok"
+
+    result = asyncio.run(limiter.call(flaky, retry_on=(ServerError,), throttle_on=(Throttled,)))
+    assert result == "ok" and len(calls) == 3
+    assert limiter.concurrency == 8.0
+
+def test_other_errors_are_not_retried(clock):
+    limiter = RateLimiter(rpm=100, tpm=100_000, clock=clock)
+    calls = []
+
+    async def broken():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.call(broken, retry_on=(Throttled,)))
+    assert len(calls) == 1
+    assert limiter._in_flight == 0